@@ -1,17 +1,18 @@
 import cv2
-import numpy as np
 import mediapipe as mp
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense
-from tensorflow.keras.utils import to_categorical
-import tensorflow as tf
+
+from motion import MOTION_LABELS, TRAJECTORY_LENGTH
+from trajectory_store import TrajectoryWriter, count_windows
 
 # ——— Configuration ————————————————————————————————
-LABELS = ['J', 'Z']
-SAMPLES_PER_CLASS = 100
-BUFFER_LENGTH = 15
+# Collection only: trajectories are appended to MOTION_DIR and the model is
+# trained separately with `python train_motion.py`, so a failed or repeated
+# training run never needs a new capture session.
+LABELS = MOTION_LABELS
+SAMPLES_PER_CLASS = 100                 # training windows per label
+BUFFER_LENGTH = TRAJECTORY_LENGTH
+STRIDE = 5                              # frames between consecutive windows of one recording
+MOTION_DIR = 'data/motion'
 
 # ——— MediaPipe & Webcam Setup ————————————————————
 mp_hands = mp.solutions.hands
@@ -24,14 +25,13 @@ if not cap.isOpened():
     print("❌ Error: Could not open webcam.")
     exit()
 
-data = []
-labels = []
+writer = TrajectoryWriter(MOTION_DIR, LABELS)
 
 # ——— Collect Motion Data ——————————————————————————
 def collect_data(label):
     print(f"⏳ Collecting motion data for '{label}'...")
-    collected = 0
-    buffer = []
+    collected = 0     # windows in finished recordings
+    current = 0       # windows in the open recording
 
     while collected < SAMPLES_PER_CLASS:
         ret, frame = cap.read()
@@ -47,58 +47,43 @@ def collect_data(label):
             hand = res.multi_hand_landmarks[0]
             mp_drawing.draw_landmarks(frame, hand, mp_hands.HAND_CONNECTIONS)
 
-            # Use index finger tip (landmark 8)
-            x8, y8 = hand.landmark[8].x, hand.landmark[8].y
-            buffer.append((x8, y8))
-
-            if len(buffer) > BUFFER_LENGTH:
-                buffer.pop(0)
-
-            if len(buffer) == BUFFER_LENGTH:
-                flat = np.array(buffer).flatten()
-                data.append(flat)
-                labels.append(label)
-                collected += 1
-                buffer.clear()
+            # Use index finger tip (landmark 8); a lost hand ends the recording,
+            # so windows never span a gap in tracking
+            if not len(writer):
+                writer.begin(label)
+            writer.push(hand.landmark[8].x, hand.landmark[8].y)
+            current = count_windows(len(writer), BUFFER_LENGTH, STRIDE)
+        else:
+            writer.end(min_length=BUFFER_LENGTH)
+            collected += current
+            current = 0
 
         # Progress text
-        cv2.putText(frame, f"{label}: {collected}/{SAMPLES_PER_CLASS}", (10, 40),
+        total = collected + current
+        cv2.putText(frame, f"{label}: {total}/{SAMPLES_PER_CLASS}", (10, 40),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
 
         cv2.imshow("✋ Motion Data Collection", frame)
 
+        if total >= SAMPLES_PER_CLASS:
+            break
+
         # Exit on 'q'
         if cv2.waitKey(1) & 0xFF == ord('q'):
             print("👋 Quit manually.")
             break
 
-# ——— Data Collection Loop ————————————————————————
-for label in LABELS:
-    input(f"\n➡️ Press ENTER to start collecting for '{label}'...")
-    collect_data(label)
-
-cap.release()
-cv2.destroyAllWindows()
+    writer.end(min_length=BUFFER_LENGTH)
 
-# ——— Model Training ——————————————————————————————
-print("🧠 Training motion recognition model...")
-
-X = np.array(data)
-y = np.array(labels)
-
-encoder = LabelEncoder()
-y_enc = to_categorical(encoder.fit_transform(y))
-
-X_train, X_test, y_train, y_test = train_test_split(X, y_enc, test_size=0.2, random_state=42)
-
-model = Sequential([
-    Dense(64, activation='relu', input_shape=(BUFFER_LENGTH * 2,)),
-    Dense(32, activation='relu'),
-    Dense(len(LABELS), activation='softmax')
-])
-
-model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
-model.fit(X_train, y_train, epochs=20, batch_size=8, validation_data=(X_test, y_test))
-
-model.save("motion_model_jz.h5")
-print("✅ Model saved as 'motion_model_jz.h5'")
+# ——— Data Collection Loop ————————————————————————
+try:
+    for label in LABELS:
+        input(f"\n➡️ Press ENTER to start collecting for '{label}'...")
+        collect_data(label)
+finally:
+    writer.close()
+    cap.release()
+    cv2.destroyAllWindows()
+
+print(f"✅ {writer.recordings} recordings stored in '{MOTION_DIR}'")
+print("➡️ Train with: python train_motion.py")
@@ -1,29 +1,27 @@
 import cv2
 import numpy as np
 import os
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.image import img_to_array
+import sys
+
+# This script sits one level below OpenCV/; landmarks.use_backend() knows where the backend is
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from landmarks import use_backend
+
+# The shared model registry lives with the backend emotion analyzer
+use_backend()
+import model_registry
 
 def initialize_model():
-    print("[INFO] Importing TensorFlow and Keras...")
-    model_path = 'models/fer2013_mini_XCEPTION.102-0.66.hdf5'
+    # One copy of the model lives in OpenCV/models; resolve() finds it from here
+    model_path = model_registry.resolve('models/fer2013_mini_XCEPTION.102-0.66.hdf5')
     if not os.path.exists(model_path):
         print(f"[ERROR] Model file not found at {model_path}")
         return None
     
     try:
         print("[INFO] Loading model...")
-        # Load model without compiling
-        model = load_model(model_path, compile=False)
-        
-        # Recompile with current optimizer (not legacy)
-        model.compile(
-            optimizer=tf.keras.optimizers.Adam(learning_rate=0.0001),
-            loss='categorical_crossentropy',
-            metrics=['accuracy']
-        )
-        return model
+        # Loaded for inference only and warmed up by the registry
+        return model_registry.keras_model(model_path).model
     except Exception as e:
         print(f"[ERROR] Failed to load model: {str(e)}")
         return None
@@ -82,9 +80,7 @@ def main():
             # Extract and preprocess the face ROI
             roi_gray = gray[y:y+h, x:x+w]
             roi_gray = cv2.resize(roi_gray, (64, 64))
-            roi = roi_gray.astype("float") / 255.0
-            roi = img_to_array(roi)
-            roi = np.expand_dims(roi, axis=0)
+            roi = (roi_gray.astype("float32") / 255.0)[np.newaxis, :, :, np.newaxis]
 
             # Make prediction
             preds = model.predict(roi, verbose=0)[0]
@@ -1,10 +1,12 @@
+import time
+_START = time.perf_counter()
+
 import cv2
 import numpy as np
-import mediapipe as mp
-import pyttsx3
+import os
+import queue
+import sys
 import threading
-import tensorflow as tf
-from PIL import Image
 from PyQt5.QtCore import Qt, QTimer, QEvent, QObject
 from PyQt5.QtGui import QImage, QPixmap
 from PyQt5.QtWidgets import (
@@ -12,29 +14,89 @@ from PyQt5.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QWidget, QMainWindow
 )
 
-# Load TFLite Model
-interpreter = tf.lite.Interpreter(model_path='asl_dense.tflite')
-interpreter.allocate_tensors()
-input_idx = interpreter.get_input_details()[0]['index']
-output_idx = interpreter.get_output_details()[0]['index']
-
+from capture_pipeline import CapturePipeline
+from landmarks import LandmarkBufferPool, StaticClassifier, landmarks_into, use_backend, variant_path, NUM_FEATURES
+
+# Shared stage metrics live with the backend
+use_backend()
+import metrics
+from letter_smoother import HandSmoothers
+from motion import MotionClassifier
+
+# Hands tracked and classified per frame (two-handed users, multiple signers)
+MAX_HANDS = 2
+# Largest wrist move between frames (normalized units) still counted as the same hand for J/Z
+MOTION_MAX_WRIST_JUMP = 0.2
+
+# asl_dense variant from export_models.py: float32, float16, dynamic, int8 or pruned-<variant>
+ASL_MODEL_VARIANT = os.environ.get('SIGNIFY_ASL_VARIANT', 'float32')
+
+# SIGNIFY_METRICS=1 records stage histograms (logged every SIGNIFY_METRICS_LOG_INTERVAL s);
+# SIGNIFY_TRACE_EVERY=N also traces every Nth frame into signify_trace.json on exit
+METRICS_LOG_INTERVAL = float(os.environ.get('SIGNIFY_METRICS_LOG_INTERVAL', '30'))
+TRACE_EVERY = int(os.environ.get('SIGNIFY_TRACE_EVERY', '0'))
+TRACE_PATH = 'signify_trace.json'
+
+# Models, MediaPipe and TTS are loaded by load_models() on a background thread once the
+# window is up (see SignifyApp), so importing this module and opening the window is fast.
+# TFLite Model; shared by the GUI (space key) and the processing thread (continuous mode)
+static_classifier = None
+# Learned J/Z model over the index-fingertip trajectory; only used on the processing thread
+motion_classifier = None
 # MediaPipe Hands Setup
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1,
-                       min_detection_confidence=0.7, min_tracking_confidence=0.7)
-mp_draw = mp.solutions.drawing_utils
-joint_style = mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2, circle_radius=4)
-conn_style = mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+mp_hands = hands = mp_draw = joint_style = conn_style = None
 
 # Labels & TTS
 STATIC_LABELS = [chr(i) for i in range(65, 91)]
-tts_engine = pyttsx3.init()
+tts_engine = None
+_tts_lock = threading.Lock()
+
+
+def load_models():
+    """Import and load the ASL/J-Z models and MediaPipe Hands, then warm them up."""
+    global static_classifier, motion_classifier, mp_hands, hands, mp_draw, joint_style, conn_style
+    import mediapipe as mp
+
+    static_classifier = StaticClassifier(variant_path('asl_dense.tflite', ASL_MODEL_VARIANT), max_batch=MAX_HANDS)
+    motion_classifier = MotionClassifier('motion_model_jz.h5')
+
+    mp_hands = mp.solutions.hands
+    hands = mp_hands.Hands(static_image_mode=False, max_num_hands=MAX_HANDS,
+                           min_detection_confidence=0.7, min_tracking_confidence=0.7)
+    mp_draw = mp.solutions.drawing_utils
+    joint_style = mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2, circle_radius=4)
+    conn_style = mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+
+    # The first invoke/process allocates; do it here rather than on the first camera frame
+    static_classifier.classify_batch(np.zeros((MAX_HANDS, NUM_FEATURES), dtype=np.float32))
+    hands.process(np.zeros((480, 640, 3), dtype=np.uint8))
+
+
+def get_tts_engine():
+    global tts_engine
+    with _tts_lock:
+        if tts_engine is None:
+            import pyttsx3
+            tts_engine = pyttsx3.init()
+    return tts_engine
+
+
+class FrameResult:
+    """What the processing thread hands to the GUI for one camera frame."""
+    __slots__ = ('qimage', 'landmarks', 'handedness')
+
+    def __init__(self, qimage, landmarks=None, handedness=None):
+        self.qimage = qimage
+        # (N, 63) view, one row per hand, with 'Left'/'Right' labels in the same order
+        self.landmarks = landmarks
+        self.handedness = handedness
 
 
 def threaded_speak(text):
     def run():
-        tts_engine.say(text)
-        tts_engine.runAndWait()
+        engine = get_tts_engine()
+        engine.say(text)
+        engine.runAndWait()
     threading.Thread(target=run).start()
 
 
@@ -56,10 +118,20 @@ class SignifyApp(QMainWindow):
         self.speak_button = QPushButton("Speak Text")
         self.clear_button = QPushButton("Clear")
         self.jz_button = QPushButton("J/Z Mode: OFF")
+        self.continuous_button = QPushButton("Continuous: OFF")
         self.exit_button = QPushButton("Exit")
 
         self.jz_mode = False
+        # Wrist of the hand the J/Z ring was last fed from; only touched from the processing thread
+        self._motion_wrist = None
+        self.continuous_mode = False
+        # One smoother per hand, matched by wrist position; only touched from the processing thread
+        self.smoothers = HandSmoothers(len(STATIC_LABELS), max_hands=MAX_HANDS)
+        self._smoother_active = False
+        # Committed letters bypass the latest-wins result slot so none are lost
+        self.committed_letters = queue.SimpleQueue()
         self.jz_button.clicked.connect(self.toggle_jz_mode)
+        self.continuous_button.clicked.connect(self.toggle_continuous_mode)
         self.speak_button.clicked.connect(self.speak_text)
         self.clear_button.clicked.connect(self.clear_text)
         self.exit_button.clicked.connect(self.close)
@@ -68,11 +140,16 @@ class SignifyApp(QMainWindow):
         button_layout.addWidget(self.speak_button)
         button_layout.addWidget(self.clear_button)
         button_layout.addWidget(self.jz_button)
+        button_layout.addWidget(self.continuous_button)
         button_layout.addWidget(self.exit_button)
 
+        self.stats_label = QLabel(self)
+        self.stats_label.setStyleSheet("font-size: 12px; color: gray")
+
         right_layout = QVBoxLayout()
         right_layout.addWidget(self.text_box)
         right_layout.addLayout(button_layout)
+        right_layout.addWidget(self.stats_label)
 
         main_layout = QHBoxLayout()
         main_layout.addWidget(self.video_label, stretch=3)
@@ -89,18 +166,51 @@ class SignifyApp(QMainWindow):
             exit(1)
 
         self.landmarks = None
-        self.motion_buffer = []
-        self.motion_len = 15
+        self.handedness = []
+        self._landmark_buf = np.zeros((MAX_HANDS, NUM_FEATURES), dtype=np.float32)
+        # Processing-thread side: preallocated landmark and probability buffers
+        self._landmark_pool = LandmarkBufferPool(max_hands=MAX_HANDS)
+        self._probs = np.zeros((MAX_HANDS, len(STATIC_LABELS)), dtype=np.float32)
+
+        sink = None
+        if metrics.is_enabled():
+            metrics.enable(trace_every=TRACE_EVERY)
+            if METRICS_LOG_INTERVAL > 0:
+                metrics.start_log_dump(METRICS_LOG_INTERVAL, log=print)
+            sink = lambda name, start, ms: metrics.record("signify." + name, start, ms)
+
+        # Capture and MediaPipe run on worker threads; the GUI timer only blits finished frames.
+        # The pipeline starts once load_models() has finished on its own thread.
+        self.pipeline = CapturePipeline(self.cap, self.process_frame, sink=sink)
+        self.models_ready = threading.Event()
+        self.model_error = None
+        self.stats_label.setText("Loading models...")
+        threading.Thread(target=self._load_models, name="signify-load", daemon=True).start()
 
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)
+        self.timer.start(15)
+
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.update_stats)
+        self.stats_timer.start(1000)
 
         self.installEventFilter(self)
         self.text_box.installEventFilter(self)  # <-- IMPORTANT LINE
 
         self.setStyleSheet("QPushButton { font-size: 16px; padding: 10px } QTextEdit { padding: 10px }")
         self.showMaximized()
+        print(f"[INFO] Window shown {time.perf_counter() - _START:.2f}s after start")
+
+    def _load_models(self):
+        try:
+            load_models()
+        except Exception as e:
+            self.model_error = e
+            print(f"[ERROR] Failed to load models: {str(e)}")
+            return
+        print(f"[INFO] Models ready {time.perf_counter() - _START:.2f}s after start")
+        self.models_ready.set()
 
     def eventFilter(self, obj, event):
         if event.type() == QEvent.KeyPress and event.key() == Qt.Key_Space:
@@ -112,60 +222,139 @@ class SignifyApp(QMainWindow):
         self.jz_mode = not self.jz_mode
         self.jz_button.setText(f"J/Z Mode: {'ON' if self.jz_mode else 'OFF'}")
 
-    def update_frame(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            return
-
+    def toggle_continuous_mode(self):
+        self.continuous_mode = not self.continuous_mode
+        self.continuous_button.setText(f"Continuous: {'ON' if self.continuous_mode else 'OFF'}")
+
+    def _motion_hand(self, landmarks):
+        """Index of the hand that feeds the J/Z trajectory ring.
+
+        MediaPipe's hand order changes between frames, so the ring follows the
+        hand whose wrist is nearest the one it was last fed from. If that hand
+        is gone (no wrist within MOTION_MAX_WRIST_JUMP), the ring restarts on
+        the nearest remaining hand instead of mixing two fingertips into one
+        trajectory.
+        """
+        wrists = landmarks[:, :2]
+        index = 0
+        if self._motion_wrist is not None:
+            dist = np.linalg.norm(wrists - self._motion_wrist, axis=1)
+            index = int(np.argmin(dist))
+            if dist[index] > MOTION_MAX_WRIST_JUMP:
+                motion_classifier.reset()
+        self._motion_wrist = wrists[index].copy()
+        return index
+
+    def process_frame(self, frame):
+        """Runs on the pipeline's processing thread: MediaPipe, drawing and QImage conversion."""
+        with metrics.frame("signify.frame"):
+            return self._process_frame(frame)
+
+    def _process_frame(self, frame):
+        timings = self.pipeline.timings
         frame = cv2.flip(frame, 1)
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        res = hands.process(rgb)
+        with timings.stage("hands"):
+            res = hands.process(rgb)
 
-        if res.multi_hand_landmarks:
-            hand = res.multi_hand_landmarks[0]
-            mp_draw.draw_landmarks(frame, hand, mp_hands.HAND_CONNECTIONS, joint_style, conn_style)
+        continuous = self.continuous_mode
+        if continuous != self._smoother_active:
+            self.smoothers.reset()
+            self._smoother_active = continuous
 
-            self.landmarks = np.array([[lm.x, lm.y, lm.z] for lm in hand.landmark]).flatten().astype(np.float32)
+        landmarks = None
+        handedness = []
+        if res.multi_hand_landmarks:
+            detected = res.multi_hand_landmarks[:MAX_HANDS]
+            batch = self._landmark_pool.next()
+            with timings.stage("draw"):
+                for hand in detected:
+                    mp_draw.draw_landmarks(rgb, hand, mp_hands.HAND_CONNECTIONS, joint_style, conn_style)
 
-            x8, y8 = hand.landmark[8].x, hand.landmark[8].y
-            self.motion_buffer.append((x8, y8))
-            if len(self.motion_buffer) > self.motion_len:
-                self.motion_buffer.pop(0)
+            for i, hand in enumerate(detected):
+                landmarks_into(hand, batch[i])
+            landmarks = batch[:len(detected)]
+            handedness = [h.classification[0].label for h in res.multi_handedness[:len(detected)]]
 
             if self.jz_mode:
-                dyn = self.detect_motion()
+                # Index fingertip (landmark 8) of the tracked hand; the model only runs while it moves
+                tip = detected[self._motion_hand(landmarks)].landmark[8]
+                with timings.stage("motion"):
+                    dyn = motion_classifier.update(tip.x, tip.y)
                 if dyn:
-                    self.append_and_speak(dyn)
+                    self.committed_letters.put(dyn)
+
+            if continuous:
+                with timings.stage("classify"):
+                    # Every hand in one batched invoke
+                    probs = static_classifier.classify_batch(landmarks, out=self._probs[:len(detected)],
+                                                            handedness=handedness)
+                # Wrist x, y are the first two values of each hand's landmarks
+                slots = self.smoothers.assign(landmarks[:, :2])
+                for hand, side, slot, hand_probs in zip(detected, handedness, slots, probs):
+                    committed = self.smoothers[slot].update(hand_probs)
+                    if committed is not None:
+                        self.committed_letters.put(STATIC_LABELS[committed])
+                    wrist = hand.landmark[0]
+                    cv2.putText(rgb, f"{side}: {STATIC_LABELS[int(np.argmax(hand_probs))]}",
+                                (int(wrist.x * rgb.shape[1]), int(wrist.y * rgb.shape[0]) + 30),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 0), 2)
+
+        if not handedness or not self.jz_mode:
+            # A broken trajectory isn't a gesture
+            motion_classifier.reset()
+            self._motion_wrist = None
+
+        if continuous and not handedness:
+            # A hand that left the frame may repeat its last letter when it comes back
+            self.smoothers.assign(())
+
+        with timings.stage("qimage"):
+            height, width, _ = rgb.shape
+            bytes_per_line = 3 * width
+            # copy() detaches the QImage from the numpy buffer before it leaves this thread
+            qimg = QImage(rgb.data, width, height, bytes_per_line, QImage.Format_RGB888).copy()
+        return FrameResult(qimg, landmarks, handedness)
+
+    def update_frame(self):
+        if not self.pipeline.running:
+            if self.models_ready.is_set():
+                self.pipeline.start()
+            return
+
+        while not self.committed_letters.empty():
+            self.append_and_speak(self.committed_letters.get())
+
+        result = self.pipeline.poll()
+        if result is None:
+            return
 
-        height, width, _ = rgb.shape
-        bytes_per_line = 3 * width
-        qimg = QImage(rgb.data, width, height, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qimg)
-        self.video_label.setPixmap(pixmap.scaled(self.video_label.size(), Qt.KeepAspectRatio))
+        with self.pipeline.timings.stage("blit"):
+            if result.landmarks is not None:
+                n = len(result.landmarks)
+                np.copyto(self._landmark_buf[:n], result.landmarks)
+                self.landmarks = self._landmark_buf[:n]
+                self.handedness = result.handedness
+
+            pixmap = QPixmap.fromImage(result.qimage)
+            self.video_label.setPixmap(pixmap.scaled(self.video_label.size(), Qt.KeepAspectRatio))
+
+    def update_stats(self):
+        if not self.pipeline.running:
+            self.stats_label.setText(f"Failed to load models: {self.model_error}" if self.model_error
+                                     else "Loading models...")
+            return
+        stats = f"{self.pipeline.timings.format()} | dropped {self.pipeline.frames.dropped}"
+        if self.pipeline.errors:
+            stats += f" | {self.pipeline.errors} failed frames, last: {self.pipeline.last_error}"
+        self.stats_label.setText(stats)
 
     def predict_static(self):
         if self.landmarks is None:
             return
-        interpreter.set_tensor(input_idx, [self.landmarks])
-        interpreter.invoke()
-        out = interpreter.get_tensor(output_idx)[0]
-        idx = int(np.argmax(out))
-        letter = STATIC_LABELS[idx]
-        self.append_and_speak(letter)
-
-    def detect_motion(self):
-        if len(self.motion_buffer) < self.motion_len:
-            return None
-        xs, ys = zip(*self.motion_buffer)
-        dx = xs[-1] - xs[0]
-        dy = ys[-1] - ys[0]
-        if dy > 0.20 and dx < -0.10:
-            self.motion_buffer.clear()
-            return 'J'
-        if dx > 0.20 and any(x < xs[0] for x in xs[-3:]):
-            self.motion_buffer.clear()
-            return 'Z'
-        return None
+        out = static_classifier.classify_batch(self.landmarks, handedness=self.handedness)
+        letters = "".join(STATIC_LABELS[int(idx)] for idx in np.argmax(out, axis=1))
+        self.append_and_speak(letters)
 
     def append_and_speak(self, char):
         self.text_box.insertPlainText(char)
@@ -181,6 +370,11 @@ class SignifyApp(QMainWindow):
         self.text_box.clear()
 
     def closeEvent(self, event):
+        self.timer.stop()
+        self.stats_timer.stop()
+        self.pipeline.stop()
+        if metrics.is_enabled() and TRACE_EVERY:
+            print(f"[INFO] Wrote {metrics.write_trace(TRACE_PATH)} trace events to {TRACE_PATH}")
         if self.cap.isOpened():
             self.cap.release()
         event.accept()
@@ -0,0 +1,288 @@
+# batch_translate.py
+#
+# Headless translation of recorded sessions: ASL letters (MediaPipe + asl_dense)
+# and facial emotions (FER mini-XCEPTION) for every frame of every video, written
+# as timestamped JSONL or Parquet records.
+
+import argparse
+import glob
+import json
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+STATIC_LABELS = [chr(i) for i in range(65, 91)]
+_DONE = object()
+
+
+def find_videos(inputs):
+    videos = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for ext in VIDEO_EXTENSIONS:
+                videos.extend(glob.glob(os.path.join(path, '**', '*' + ext), recursive=True))
+        else:
+            videos.append(path)
+    return sorted(set(videos))
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once ``stop`` is set, so no stage waits on a consumer that has quit."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(q, stop):
+    """Blocking get that returns _DONE once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _DONE
+
+
+def _decode(path, stride, frames, stop, errors):
+    """Stage 1: read and subsample frames into a bounded queue."""
+    cap = None
+    try:
+        import cv2
+
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise IOError(f"Cannot open video {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        index = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if index % stride == 0 and not _put(frames, (index, index / fps, frame), stop):
+                break
+            index += 1
+    except Exception as e:
+        errors.append(e)
+    finally:
+        if cap is not None:
+            cap.release()
+        # Always end the stream, even on failure, so the next stage never waits forever
+        _put(frames, _DONE, stop)
+
+
+def _detect(frames, detected, hands, face_detector, max_hands, stop, errors):
+    """Stage 2: MediaPipe landmarks and face boxes."""
+    try:
+        import cv2
+        import numpy as np
+        from landmarks import landmarks_into, NUM_FEATURES
+
+        while True:
+            item = _get(frames, stop)
+            if item is _DONE:
+                return
+            index, t, frame = item
+            res = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            landmarks = np.zeros((0, NUM_FEATURES), dtype=np.float32)
+            handedness = []
+            if res.multi_hand_landmarks:
+                found = res.multi_hand_landmarks[:max_hands]
+                landmarks = np.empty((len(found), NUM_FEATURES), dtype=np.float32)
+                for i, hand in enumerate(found):
+                    landmarks_into(hand, landmarks[i])
+                handedness = [h.classification[0].label for h in res.multi_handedness[:len(found)]]
+
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            faces = face_detector.detect(gray) if face_detector is not None else []
+            if not _put(detected, (index, t, landmarks, handedness, gray, faces), stop):
+                return
+    except Exception as e:
+        errors.append(e)
+    finally:
+        _put(detected, _DONE, stop)
+
+
+def translate_video(path, part_path, options):
+    """Run the three-stage pipeline over one video; returns (path, frames, seconds)."""
+    import mediapipe
+    import numpy as np
+    from landmarks import StaticClassifier, use_backend, variant_path
+    from letter_smoother import HandSmoothers
+
+    start = time.perf_counter()
+    static_classifier = StaticClassifier(variant_path(options['asl_model'], options['asl_variant']),
+                                         max_batch=options['max_hands'])
+    hands = mediapipe.solutions.hands.Hands(static_image_mode=False, max_num_hands=options['max_hands'],
+                                            min_detection_confidence=0.7, min_tracking_confidence=0.7)
+    analyzer = None
+    if options['emotion_model']:
+        use_backend()
+        from main import EmotionAnalyzer
+        analyzer = EmotionAnalyzer(model_path=options['emotion_model'])
+        if analyzer.model is None:
+            analyzer = None
+    # Matched to hands by wrist position, since MediaPipe's handedness labels can repeat
+    smoothers = HandSmoothers(len(STATIC_LABELS), max_hands=options['max_hands'])
+
+    frames = queue.Queue(maxsize=32)
+    detected = queue.Queue(maxsize=32)
+    # Stages record their exception in ``errors`` and still end the stream with _DONE;
+    # ``stop`` tells them to give up when a later stage has quit
+    stop = threading.Event()
+    errors = []
+    stages = [
+        threading.Thread(target=_decode, args=(path, options['stride'], frames, stop, errors), daemon=True),
+        threading.Thread(target=_detect, args=(frames, detected, hands,
+                                               analyzer.face_detector if analyzer else None,
+                                               options['max_hands'], stop, errors), daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+
+    # Stage 3 (this thread): batched ASL and emotion inference, then write records
+    count = 0
+    try:
+        with open(part_path, 'w') as out:
+            while True:
+                item = detected.get()
+                if item is _DONE:
+                    break
+                index, t, landmarks, handedness, gray, faces = item
+
+                letters = []
+                # Wrist x, y lead each hand's landmarks; hands that left release their smoother
+                slots = smoothers.assign(landmarks[:, :2])
+                if len(landmarks):
+                    probs = static_classifier.classify_batch(landmarks, handedness=handedness)
+                    for side, slot, hand_probs in zip(handedness, slots, probs):
+                        idx = int(np.argmax(hand_probs))
+                        committed = smoothers[slot].update(hand_probs)
+                        letters.append({
+                            "hand": side,
+                            "track": slot,
+                            "letter": STATIC_LABELS[idx],
+                            "confidence": round(float(hand_probs[idx]), 4),
+                            "committed": STATIC_LABELS[committed] if committed is not None else None,
+                        })
+
+                emotions = []
+                if analyzer is not None and len(faces):
+                    boxes, preds = analyzer.predict_faces(gray, faces)
+                    for (x, y, w, h), face_probs in zip(boxes, preds):
+                        idx = int(np.argmax(face_probs))
+                        emotions.append({
+                            "box": [int(x), int(y), int(w), int(h)],
+                            "emotion": analyzer.emotion_labels[idx],
+                            "confidence": round(float(face_probs[idx]), 4),
+                        })
+
+                out.write(json.dumps({"video": path, "frame": index, "t": round(t, 3),
+                                      "letters": letters, "emotions": emotions}) + "\n")
+                count += 1
+    finally:
+        stop.set()
+        for stage in stages:
+            stage.join()
+        hands.close()
+    if errors:
+        raise errors[0]
+    return path, count, time.perf_counter() - start
+
+
+def _init_worker(threads):
+    # Keep TF/OpenCV from oversubscribing cores when several videos run at once
+    os.environ.setdefault('TF_NUM_INTRAOP_THREADS', str(threads))
+    os.environ.setdefault('TF_NUM_INTEROP_THREADS', '1')
+    import cv2
+    cv2.setNumThreads(threads)
+
+
+def write_output(part_paths, output):
+    if output.endswith('.parquet'):
+        import pandas as pd
+        records = []
+        for part in part_paths:
+            with open(part) as f:
+                records.extend(json.loads(line) for line in f)
+        frame = pd.DataFrame.from_records(records)
+        # Nested lists are stored as JSON strings so any Parquet engine can read them
+        for column in ('letters', 'emotions'):
+            frame[column] = frame[column].map(json.dumps)
+        frame.to_parquet(output, index=False)
+    else:
+        with open(output, 'wb') as out:
+            for part in part_paths:
+                with open(part, 'rb') as f:
+                    shutil.copyfileobj(f, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translate recorded videos to letter and emotion tracks")
+    parser.add_argument('inputs', nargs='+', help="Video files or directories")
+    parser.add_argument('-o', '--output', default='translations.jsonl', help=".jsonl or .parquet")
+    parser.add_argument('--asl-model', default='asl_dense.tflite')
+    parser.add_argument('--asl-variant', default='float32', help="Variant exported by export_models.py")
+    parser.add_argument('--emotion-model', default='models/fer2013_mini_XCEPTION.102-0.66.hdf5',
+                        help="Empty string skips emotion recognition")
+    parser.add_argument('--stride', type=int, default=1, help="Process every Nth frame")
+    parser.add_argument('--max-hands', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=max(1, mp.cpu_count() // 2),
+                        help="Videos processed in parallel, one process each")
+    parser.add_argument('--threads-per-worker', type=int, default=2)
+    args = parser.parse_args()
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        print("[ERROR] No videos found.")
+        return
+
+    options = {
+        'asl_model': os.path.abspath(args.asl_model),
+        'asl_variant': args.asl_variant,
+        'emotion_model': os.path.abspath(args.emotion_model) if args.emotion_model else '',
+        'stride': max(1, args.stride),
+        'max_hands': args.max_hands,
+    }
+    workers = min(args.workers, len(videos))
+    print(f"[INFO] Translating {len(videos)} videos with {workers} worker processes...")
+
+    start = time.perf_counter()
+    total_frames = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        parts = [os.path.join(tmp, f"{i}.jsonl") for i in range(len(videos))]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(args.threads_per_worker,)) as pool:
+            futures = {pool.submit(translate_video, video, part, options): (video, part)
+                       for video, part in zip(videos, parts)}
+            succeeded = set()
+            for future in as_completed(futures):
+                try:
+                    path, frames, seconds = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Translation of {futures[future][0]} failed: {str(e)}")
+                    continue
+                succeeded.add(futures[future][1])
+                total_frames += frames
+                print(f"[INFO] {path}: {frames} frames in {seconds:.1f}s ({frames / seconds:.1f} fps)")
+        # Failed videos may have no part file, or a truncated one; keep input order for the rest
+        write_output([part for part in parts if part in succeeded], args.output)
+
+    elapsed = time.perf_counter() - start
+    cores = workers * args.threads_per_worker
+    print(f"[INFO] {total_frames} frames in {elapsed:.1f}s: {total_frames / elapsed:.1f} fps total, "
+          f"{total_frames / elapsed / cores:.1f} fps per core ({cores} cores)")
+    print(f"[INFO] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from landmarks import LandmarkBufferPool, StaticClassifier, landmarks_into, NUM_LANDMARKS
+
+
+class FakeLandmark:
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class FakeHand:
+    """Stands in for a MediaPipe NormalizedLandmarkList."""
+
+    def __init__(self, rng):
+        self.landmark = [FakeLandmark(*rng.random(3)) for _ in range(NUM_LANDMARKS)]
+
+
+def old_path(hand, classifier):
+    """Previous update_frame + predict_static: list comp, flatten, astype, set_tensor([list])."""
+    landmarks = np.array([[lm.x, lm.y, lm.z] for lm in hand.landmark]).flatten().astype(np.float32)
+    interpreter = classifier.interpreter
+    interpreter.set_tensor(interpreter.get_input_details()[0]['index'], [landmarks])
+    interpreter.invoke()
+    return interpreter.get_tensor(interpreter.get_output_details()[0]['index'])[0]
+
+
+def new_path(hand, classifier, pool, probs):
+    return classifier.classify(landmarks_into(hand, pool.next()), out=probs)
+
+
+def measure(fn, frames):
+    """Mean microseconds per call and mean transient heap bytes allocated by one call."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    us = (time.perf_counter() - start) * 1e6 / frames
+
+    tracemalloc.start()
+    fn()
+    transient = 0
+    samples = min(frames, 200)
+    for _ in range(samples):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        transient += peak - base
+    tracemalloc.stop()
+    return us, transient / samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Landmark-to-tensor cost per frame, old vs preallocated path")
+    parser.add_argument('--model', default='asl_dense.tflite')
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--max-hands', type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    hand = FakeHand(rng)
+    classifier = StaticClassifier(args.model)
+    pool = LandmarkBufferPool()
+    probs = np.zeros(26, dtype=np.float32)
+
+    print(f"{'path':<14} {'us/frame':>9} {'heap bytes/frame':>17}")
+    for name, fn in (('old', lambda: old_path(hand, classifier)),
+                     ('preallocated', lambda: new_path(hand, classifier, pool, probs))):
+        us, heap = measure(fn, args.frames)
+        print(f"{name:<14} {us:>9.1f} {heap:>17.0f}")
+
+    # Per-frame latency vs hand count: one invoke per hand vs one batched invoke
+    batched = StaticClassifier(args.model, max_batch=args.max_hands)
+    pool = LandmarkBufferPool(max_hands=args.max_hands)
+    single_pool = LandmarkBufferPool()
+    hands = [FakeHand(rng) for _ in range(args.max_hands)]
+    out = np.zeros((args.max_hands, 26), dtype=np.float32)
+    print(f"\n{'hands':>5} {'per-hand us':>12} {'batched us':>11}")
+    for n in range(1, args.max_hands + 1):
+        def per_hand():
+            for hand in hands[:n]:
+                new_path(hand, classifier, single_pool, probs)
+
+        def one_batch():
+            batch = pool.next()
+            for i, hand in enumerate(hands[:n]):
+                landmarks_into(hand, batch[i])
+            batched.classify_batch(batch[:n], out=out[:n])
+
+        looped, _ = measure(per_hand, args.frames)
+        together, _ = measure(one_batch, args.frames)
+        print(f"{n:>5} {looped:>12.1f} {together:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import multiprocessing as mp
+import resource
+
+import numpy as np
+
+
+def _run(source, epochs, batch_size, results):
+    import train_model
+
+    timer = train_model.EpochTimer()
+    if source == 'shards':
+        train_model.train_from_shards(train_model.SHARD_DIR, epochs, batch_size, timer)
+    else:
+        train_model.train_from_csv(train_model.CSV_PATH, epochs, batch_size, timer)
+    # ru_maxrss is in KiB on Linux
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((source, timer.times, peak_mib))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Epoch time and peak RSS: CSV vs memory-mapped shards")
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    # Each source in a fresh process so peak RSS isn't shared
+    ctx = mp.get_context('spawn')
+    results = ctx.Queue()
+    print(f"{'source':<8} {'first epoch s':>14} {'mean epoch s':>13} {'peak RSS MiB':>13}")
+    for source in ('csv', 'shards'):
+        proc = ctx.Process(target=_run, args=(source, args.epochs, args.batch_size, results))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            print(f"{source:<8} failed (exit code {proc.exitcode})")
+            continue
+        _, times, peak = results.get()
+        steady = times[1:] or times
+        print(f"{source:<8} {times[0]:>14.2f} {np.mean(steady):>13.2f} {peak:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
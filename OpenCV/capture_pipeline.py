@@ -0,0 +1,156 @@
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+
+class LatestQueue:
+    """Single-slot, latest-wins queue: put() never blocks and replaces anything unread."""
+
+    def __init__(self):
+        self._item = None
+        self._has_item = False
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Wait up to ``timeout`` seconds for an item; returns None if nothing arrived."""
+        with self._cond:
+            if not self._has_item:
+                self._cond.wait(timeout)
+            return self._take()
+
+    def get_nowait(self):
+        with self._cond:
+            return self._take()
+
+    def _take(self):
+        if not self._has_item:
+            return None
+        item, self._item, self._has_item = self._item, None, False
+        return item
+
+
+class StageTimings:
+    """Thread-safe per-stage timings (last, moving average, max, count) in milliseconds.
+
+    ``sink(name, start, ms)``, if given, also receives every stage timed with
+    stage(), e.g. to feed histograms or a trace.
+    """
+
+    def __init__(self, alpha=0.1, sink=None):
+        self.alpha = alpha
+        self.sink = sink
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            self.record(name, ms)
+            if self.sink is not None:
+                self.sink(name, start, ms)
+
+    def record(self, name, ms):
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                self._stats[name] = {"last_ms": ms, "avg_ms": ms, "max_ms": ms, "count": 1}
+                return
+            stat["last_ms"] = ms
+            stat["avg_ms"] += self.alpha * (ms - stat["avg_ms"])
+            stat["max_ms"] = max(stat["max_ms"], ms)
+            stat["count"] += 1
+
+    def summary(self):
+        with self._lock:
+            return {name: dict(stat) for name, stat in self._stats.items()}
+
+    def format(self):
+        return " | ".join(f"{name} {stat['avg_ms']:.1f} ms" for name, stat in self.summary().items())
+
+
+class CapturePipeline:
+    """Camera capture and frame processing on two worker threads.
+
+    The capture thread reads frames as fast as the camera delivers them into a
+    latest-wins slot; the processing thread always takes the newest frame, runs
+    ``process_fn(frame)`` and publishes its result into a second latest-wins slot
+    that the GUI polls. A slow processing step therefore drops camera frames
+    instead of building up a backlog, and never blocks the GUI thread. A frame
+    whose ``process_fn`` raises is skipped and counted in ``errors`` (the latest
+    exception is kept in ``last_error``) so one bad frame can't stop the stream.
+    """
+
+    def __init__(self, cap, process_fn, sink=None):
+        self.cap = cap
+        self.process_fn = process_fn
+        self.timings = StageTimings(sink=sink)
+        self.frames = LatestQueue()
+        self.results = LatestQueue()
+        self.errors = 0
+        self.last_error = None
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="signify-capture", daemon=True),
+            threading.Thread(target=self._process_loop, name="signify-process", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def running(self):
+        return self._running
+
+    def stop(self):
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+    def poll(self):
+        """Latest finished result, or None if nothing new since the last poll."""
+        return self.results.get_nowait()
+
+    def _capture_loop(self):
+        while self._running:
+            with self.timings.stage("capture"):
+                ret, frame = self.cap.read()
+            if not ret:
+                time.sleep(0.005)
+                continue
+            self.frames.put(frame)
+
+    def _process_loop(self):
+        while self._running:
+            frame = self.frames.get(timeout=0.1)
+            if frame is None:
+                continue
+            try:
+                with self.timings.stage("process"):
+                    result = self.process_fn(frame)
+            except Exception as e:
+                self.errors += 1
+                # Full traceback for the first failure or a new kind of failure, not for every frame
+                if self.last_error is None or repr(e) != repr(self.last_error):
+                    print(f"[ERROR] Frame processing failed ({self.errors} so far):")
+                    traceback.print_exc()
+                self.last_error = e
+                continue
+            self.results.put(result)
@@ -2,12 +2,16 @@
 
 import cv2
 import mediapipe as mp
-import csv
 import os
 
+from dataset_writer import LandmarkDatasetWriter, export_csv
+from landmarks import landmarks_into
+
 # — Configurable parameters —
 DATA_DIR = 'data'
+SHARD_DIR = os.path.join(DATA_DIR, 'landmarks')   # binary .npy shards, see dataset_writer.py
 CSV_PATH = os.path.join(DATA_DIR, 'landmarks.csv')
+EXPORT_CSV = False                                # also write the old CSV layout when done
 LETTERS = [chr(i) for i in range(65, 91)]   # A–Z
 SAMPLES_PER_LETTER = 5000                   # adjust as needed
 
@@ -26,13 +30,16 @@ if not cap.isOpened():
     print("ERROR: Could not open webcam.")
     exit(1)
 
-# — Prepare CSV file with header —
-os.makedirs(DATA_DIR, exist_ok=True)
-if not os.path.exists(CSV_PATH):
-    with open(CSV_PATH, 'w', newline='') as f:
-        writer = csv.writer(f)
-        header = [f"{axis}{i}" for axis in ('x','y','z') for i in range(21)] + ['label']
-        writer.writerow(header)
+# — Buffered binary dataset writer; disk writes happen on its own thread —
+writer = LandmarkDatasetWriter(SHARD_DIR, LETTERS)
+
+
+def finish():
+    writer.close()
+    if EXPORT_CSV:
+        export_csv(SHARD_DIR, CSV_PATH)
+    cap.release()
+    cv2.destroyAllWindows()
 
 print("Starting data collection.")
 print("Will collect %d samples for each letter A–Z." % SAMPLES_PER_LETTER)
@@ -52,8 +59,7 @@ for letter in LETTERS:
             break
         if key == ord('q'):
             print("Exiting.")
-            cap.release()
-            cv2.destroyAllWindows()
+            finish()
             exit(0)
 
     # Collect samples
@@ -69,16 +75,8 @@ for letter in LETTERS:
             hand = results.multi_hand_landmarks[0]
             mp_draw.draw_landmarks(frame, hand, mp_hands.HAND_CONNECTIONS)
 
-            # Extract landmarks
-            row = []
-            for lm in hand.landmark:
-                row.extend([lm.x, lm.y, lm.z])
-            row.append(letter)
-
-            # Save to CSV
-            with open(CSV_PATH, 'a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(row)
+            # Extract landmarks straight into the writer's buffer
+            landmarks_into(hand, writer.reserve(letter))
 
             count += 1
 
@@ -90,12 +88,13 @@ for letter in LETTERS:
         key = cv2.waitKey(1) & 0xFF
         if key == ord('q'):
             print("Aborted by user.")
-            cap.release()
-            cv2.destroyAllWindows()
+            finish()
             exit(0)
 
+    writer.flush()
     print(f"Finished collecting for '{letter}'.")
 
-print("\nData collection complete! CSV saved to:", CSV_PATH)
-cap.release()
-cv2.destroyAllWindows()
+finish()
+print("\nData collection complete! Dataset saved to:", SHARD_DIR)
+if EXPORT_CSV:
+    print("CSV exported to:", CSV_PATH)
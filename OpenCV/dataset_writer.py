@@ -0,0 +1,130 @@
+# dataset_writer.py
+#
+# Compact binary landmark dataset: float32 feature shards plus uint8 label shards
+# (.npy, memory-mappable), with the letter names in meta.json.
+
+import csv
+import glob
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+from landmarks import NUM_FEATURES
+
+META_FILE = 'meta.json'
+
+
+def shard_paths(data_dir):
+    """Sorted (features, labels) .npy path pairs in data_dir."""
+    features = sorted(glob.glob(os.path.join(data_dir, 'shard_*_X.npy')))
+    return [(x, x[:-len('_X.npy')] + '_y.npy') for x in features]
+
+
+def load_meta(data_dir):
+    with open(os.path.join(data_dir, META_FILE)) as f:
+        return json.load(f)
+
+
+class LandmarkDatasetWriter:
+    """Buffers samples in memory and writes them to disk in chunks on a background thread.
+
+    Samples go into a preallocated (chunk_size, 63) float32 block; once it is
+    full it is handed to the writer thread as one shard and a fresh block takes
+    its place, so the capture loop never waits on the disk.
+    """
+
+    def __init__(self, data_dir, label_names, chunk_size=2048):
+        self.data_dir = data_dir
+        self.label_names = list(label_names)
+        self.chunk_size = chunk_size
+        os.makedirs(data_dir, exist_ok=True)
+
+        meta_path = os.path.join(data_dir, META_FILE)
+        if os.path.exists(meta_path):
+            if load_meta(data_dir)['labels'] != self.label_names:
+                raise ValueError(f"{data_dir} was written with different labels")
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump({'labels': self.label_names, 'num_features': NUM_FEATURES}, f)
+
+        # Continue numbering after any shards from earlier sessions
+        self._next_shard = len(shard_paths(data_dir))
+        self._new_chunk()
+        self.samples_written = 0
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name="dataset-writer", daemon=True)
+        self._thread.start()
+
+    def _new_chunk(self):
+        self._features = np.empty((self.chunk_size, NUM_FEATURES), dtype=np.float32)
+        self._labels = np.empty(self.chunk_size, dtype=np.uint8)
+        self._count = 0
+
+    def reserve(self, label):
+        """Return the next sample row to fill in place (e.g. with landmarks_into)."""
+        if self._count == self.chunk_size:
+            self.flush()
+        row = self._features[self._count]
+        self._labels[self._count] = self.label_names.index(label)
+        self._count += 1
+        return row
+
+    def add(self, features, label):
+        self.reserve(label)[:] = features
+
+    def flush(self):
+        """Queue the current chunk for writing and start a new one."""
+        if self._count == 0:
+            return
+        self._queue.put((self._next_shard, self._features[:self._count], self._labels[:self._count]))
+        self._next_shard += 1
+        self._new_chunk()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            shard, features, labels = item
+            base = os.path.join(self.data_dir, f'shard_{shard:05d}')
+            # Labels first: a shard only counts once its _X.npy exists
+            np.save(base + '_y.npy', labels)
+            np.save(base + '_X.npy', features)
+            self.samples_written += len(labels)
+
+
+def load_dataset(data_dir):
+    """Concatenate every shard into in-memory (features, label indices, label names).
+
+    This reads the whole dataset into RAM; to stream shards that don't fit,
+    use landmark_dataset.make_datasets, which keeps them memory-mapped.
+    """
+    pairs = shard_paths(data_dir)
+    if not pairs:
+        return np.empty((0, NUM_FEATURES), np.float32), np.empty(0, np.uint8), load_meta(data_dir)['labels']
+    # Each shard is mapped only long enough for concatenate to copy it
+    features = [np.load(x, mmap_mode='r') for x, _ in pairs]
+    labels = [np.load(y, mmap_mode='r') for _, y in pairs]
+    return np.concatenate(features), np.concatenate(labels), load_meta(data_dir)['labels']
+
+
+def export_csv(data_dir, csv_path):
+    """Write the shards out in the original landmarks.csv layout."""
+    label_names = load_meta(data_dir)['labels']
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([f"{axis}{i}" for axis in ('x', 'y', 'z') for i in range(21)] + ['label'])
+        for x_path, y_path in shard_paths(data_dir):
+            features = np.load(x_path, mmap_mode='r')
+            labels = np.load(y_path, mmap_mode='r')
+            for row, label in zip(features, labels):
+                writer.writerow([float(v) for v in row] + [label_names[label]])
@@ -1,26 +1,27 @@
 import cv2
 import numpy as np
 import os
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.image import img_to_array
+
+from landmarks import use_backend
+
+# Face tracking and the shared model registry live with the backend emotion analyzer
+use_backend()
+import model_registry
+from tracking import FaceTracker
+
+# Full detection + classification every N frames, optical-flow tracking in between (0 = every frame)
+KEYFRAME_INTERVAL = 5
 
 def initialize_model():
-    print("[INFO] Importing TensorFlow and Keras...")
-    model_path = 'models/fer2013_mini_XCEPTION.102-0.66.hdf5'
+    model_path = model_registry.resolve('models/fer2013_mini_XCEPTION.102-0.66.hdf5')
     if not os.path.exists(model_path):
         print(f"[ERROR] Model file not found at {model_path}")
         return None
 
     try:
         print("[INFO] Loading model...")
-        model = load_model(model_path, compile=False)
-        model.compile(
-            optimizer=tf.keras.optimizers.Adam(learning_rate=0.0001),
-            loss='categorical_crossentropy',
-            metrics=['accuracy']
-        )
-        return model
+        # Loaded for inference only and warmed up, so the first frame isn't slower than the rest
+        return model_registry.keras_model(model_path).model
     except Exception as e:
         print(f"[ERROR] Failed to load model: {str(e)}")
         return None
@@ -80,9 +81,21 @@ def main():
         return
 
     emotion_labels = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
-    frame_count = 0
     emotion_display = None
 
+    def detect(gray):
+        return face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+
+    def classify(gray, boxes):
+        # All faces of a keyframe go through the model in one batch
+        rois = np.empty((len(boxes), 64, 64, 1), dtype=np.float32)
+        for i, (x, y, w, h) in enumerate(boxes):
+            rois[i, :, :, 0] = cv2.resize(gray[y:y+h, x:x+w], (64, 64))
+        rois /= 255.0
+        return model.predict(rois, verbose=0)
+
+    tracker = FaceTracker(detect, classify, keyframe_interval=KEYFRAME_INTERVAL or 1)
+
     print("\n[INFO] GUI running. Press 'q' to quit, 's' to save frame.")
 
     while True:
@@ -91,29 +104,20 @@ def main():
             print("[ERROR] Failed to read from webcam.")
             break
 
-        frame_count += 1
-        if frame_count % 2 != 0:
-            continue
-
         display_frame = frame.copy()
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
-
-        for (x, y, w, h) in faces:
-            roi_gray = gray[y:y+h, x:x+w]
-            roi_gray = cv2.resize(roi_gray, (64, 64))
-            roi = roi_gray.astype("float") / 255.0
-            roi = img_to_array(roi)
-            roi = np.expand_dims(roi, axis=0)
-
-            preds = model.predict(roi, verbose=0)[0]
-            emotion_idx = preds.argmax()
-            emotion_probability = preds[emotion_idx]
+
+        for track in tracker.update(gray):
+            if track.probs is None:
+                continue
+            x, y, w, h = track.box
+            emotion_idx = track.probs.argmax()
+            emotion_probability = track.probs[emotion_idx]
             emotion_display = f"{emotion_labels[emotion_idx]} ({emotion_probability:.2f})"
 
             # Draw face box
             cv2.rectangle(display_frame, (x, y), (x + w, y + h), (102, 255, 255), 2)
-            cv2.putText(display_frame, emotion_display, (x, y - 10),
+            cv2.putText(display_frame, f"#{track.id} {emotion_display}", (x, y - 10),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.65, (255, 255, 255), 2)
 
         # Add overlay panel
@@ -0,0 +1,179 @@
+# export_models.py
+#
+# Exports asl_dense.h5 as float32, float16, dynamic-range int8 and full-integer
+# int8 TFLite variants (optionally after magnitude pruning), then reports
+# per-invoke latency, file size and held-out accuracy for each.
+#
+# Every variant is written to asl_dense_<variant>.tflite, float32 included, so the
+# shipped asl_dense.tflite is left alone. The live app picks a variant by name,
+# see landmarks.variant_path().
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sklearn.model_selection import train_test_split
+
+from landmarks import NUM_FEATURES
+from preprocessing import load_config, normalize, save_config
+
+VARIANTS = ('float32', 'float16', 'dynamic', 'int8')
+
+
+def load_splits(shard_dir, csv_path):
+    """((X_train, y_train), (X_eval, y_eval)) with the same train/validation split train_model.py used.
+
+    The training split feeds the pruning fine-tune and int8 calibration, the
+    held-out split is only used to measure accuracy.
+    """
+    if os.path.isdir(shard_dir):
+        from dataset_writer import load_dataset
+        from landmark_dataset import is_validation
+
+        X, y, _ = load_dataset(shard_dir)
+        mask = is_validation(np.arange(len(y)), 0.2)
+        X, y = np.asarray(X, dtype=np.float32), np.asarray(y, dtype=np.int64)
+        return (X[~mask], y[~mask]), (X[mask], y[mask])
+    else:
+        df = pd.read_csv(csv_path)
+        X = df.drop('label', axis=1).values.astype('float32')
+        y = df['label'].map(lambda letter: ord(letter) - 65).values
+        # Same call as train_from_csv (stratified on the one-hot labels), so the same rows are held out
+        X_train, X_eval, y_train, y_eval = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=pd.get_dummies(df['label']).values
+        )
+        return (X_train, y_train), (X_eval, y_eval)
+
+
+def subsample(X, y, limit):
+    if len(y) > limit:
+        pick = np.random.default_rng(0).choice(len(y), limit, replace=False)
+        X, y = X[pick], y[pick]
+    return X, y
+
+
+def export_path(base, name):
+    """asl_dense.tflite + 'int8' -> asl_dense_int8.tflite. Unlike variant_path(), float32 also gets
+    its own file, so exporting never overwrites the model the app ships with."""
+    root, ext = os.path.splitext(base)
+    return f"{root}_{name}{ext}"
+
+
+def prune(model, X, y, sparsity, epochs):
+    """Magnitude-prune to the target sparsity with a short fine-tune (needs tensorflow-model-optimization)."""
+    import tensorflow_model_optimization as tfmot
+
+    steps = max(1, len(X) // 32) * epochs
+    schedule = tfmot.sparsity.keras.PolynomialDecay(0.0, sparsity, begin_step=0, end_step=steps)
+    pruned = tfmot.sparsity.keras.prune_low_magnitude(model, pruning_schedule=schedule)
+    pruned.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    pruned.fit(X, y, epochs=epochs, batch_size=32, verbose=0,
+               callbacks=[tfmot.sparsity.keras.UpdatePruningStep()])
+    return tfmot.sparsity.keras.strip_pruning(pruned)
+
+
+def convert(model, variant, representative):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if variant == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == 'dynamic':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variant == 'int8':
+        # Every op in int8, calibrated on real landmarks; input/output stay float32
+        # so the app feeds every variant the same way
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([row[np.newaxis]] for row in representative)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    return converter.convert()
+
+
+def benchmark(path, X, y, invokes):
+    """(median invoke ms at batch 1, accuracy) for a TFLite file."""
+    interpreter = tf.lite.Interpreter(model_path=path)
+    interpreter.allocate_tensors()
+    input_idx = interpreter.get_input_details()[0]['index']
+    output_idx = interpreter.get_output_details()[0]['index']
+
+    times = []
+    for i in range(invokes):
+        interpreter.set_tensor(input_idx, X[i % len(X)][np.newaxis])
+        start = time.perf_counter()
+        interpreter.invoke()
+        times.append((time.perf_counter() - start) * 1000)
+
+    correct = 0
+    for row, label in zip(X, y):
+        interpreter.set_tensor(input_idx, row[np.newaxis])
+        interpreter.invoke()
+        correct += int(np.argmax(interpreter.get_tensor(output_idx)[0]) == label)
+    return float(np.median(times)), correct / len(y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and benchmark quantized asl_dense variants")
+    parser.add_argument('--model', default='asl_dense.h5')
+    parser.add_argument('--shards', default='data/landmarks')
+    parser.add_argument('--csv', default='data/landmarks.csv')
+    parser.add_argument('--variants', default=','.join(VARIANTS))
+    parser.add_argument('--prune', type=float, default=0.0, help="Target sparsity, e.g. 0.5 (0 = no pruning)")
+    parser.add_argument('--prune-epochs', type=int, default=3)
+    parser.add_argument('--train-samples', type=int, default=20000,
+                        help="Rows from the training split for pruning and int8 calibration")
+    parser.add_argument('--eval-samples', type=int, default=5000, help="Rows from the held-out split")
+    parser.add_argument('--invokes', type=int, default=2000)
+    args = parser.parse_args()
+
+    base = os.path.splitext(args.model)[0] + '.tflite'
+    config = load_config(base)
+    model = tf.keras.models.load_model(args.model)
+
+    (X_train, y_train), (X, y) = load_splits(args.shards, args.csv)
+    X_train, y_train = subsample(X_train, y_train, args.train_samples)
+    X, y = subsample(X, y, args.eval_samples)
+    if config['normalize']:
+        X_train = normalize(X_train, out=X_train)
+        X = normalize(X, out=X)
+    # Calibration rows for full-integer quantization come from the training split, never the eval rows
+    representative = X_train[np.random.default_rng(1).permutation(len(X_train))[:500]]
+
+    variants = [v.strip() for v in args.variants.split(',') if v.strip()]
+    if args.prune > 0:
+        print(f"[INFO] Pruning to {args.prune:.0%} sparsity...")
+        try:
+            model = prune(model, X_train, y_train, args.prune, args.prune_epochs)
+        except ImportError:
+            print("[ERROR] Pruning needs tensorflow-model-optimization (pip install tensorflow-model-optimization).")
+            return
+        variants = [f"pruned-{v}" for v in variants]
+
+    report = []
+    print(f"\n{'variant':<16} {'size KiB':>9} {'invoke ms':>10} {'accuracy':>9}")
+    for name in variants:
+        variant = name.replace('pruned-', '')
+        if variant not in VARIANTS:
+            print(f"[ERROR] Unknown variant '{name}', expected one of {VARIANTS}")
+            continue
+        path = export_path(base, name)
+        with open(path, 'wb') as f:
+            f.write(convert(model, variant, representative))
+        # Every variant carries the preprocessing it expects
+        save_config(path, config['normalize'], config.get('mirror_left', False))
+
+        ms, acc = benchmark(path, X, y, args.invokes)
+        size = os.path.getsize(path)
+        report.append({'variant': name, 'path': path, 'bytes': size, 'invoke_ms': ms, 'accuracy': acc})
+        print(f"{name:<16} {size / 1024:>9.1f} {ms:>10.4f} {acc:>9.4f}")
+
+    report_path = os.path.splitext(base)[0] + '_variants.json'
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[INFO] Report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# landmark_dataset.py
+#
+# Streams the binary landmark shards written by dataset_writer.py into tf.data
+# without ever loading the whole dataset: shards stay memory-mapped and are read
+# block by block, so peak RSS depends on the shuffle buffer, not the dataset size.
+
+import numpy as np
+import tensorflow as tf
+
+from dataset_writer import load_meta, shard_paths
+from landmarks import NUM_FEATURES
+from preprocessing import augment, normalize
+
+BLOCK_SIZE = 1024
+
+
+def is_validation(indices, val_fraction):
+    """Deterministic train/val split from a multiplicative hash of the global sample index."""
+    hashed = (indices.astype(np.uint64) * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    return hashed < np.uint64(val_fraction * 2 ** 32)
+
+
+def _blocks(pairs, validation, val_fraction, shuffle_shards, seed, normalized=False, augmented=False):
+    """Yield (features, labels) blocks from the memory-mapped shards for one split."""
+    rng = np.random.default_rng(seed)
+    offsets = np.cumsum([0] + [len(np.load(y, mmap_mode='r')) for _, y in pairs])
+    order = rng.permutation(len(pairs)) if shuffle_shards else range(len(pairs))
+    for shard in order:
+        x_path, y_path = pairs[shard]
+        features = np.load(x_path, mmap_mode='r')
+        labels = np.load(y_path, mmap_mode='r')
+        for start in range(0, len(labels), BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, len(labels))
+            mask = is_validation(np.arange(offsets[shard] + start, offsets[shard] + stop), val_fraction)
+            if not validation:
+                mask = ~mask
+            # Only this block is paged in and copied
+            block = np.asarray(features[start:stop][mask], dtype=np.float32)
+            if normalized:
+                block = normalize(block, out=block)
+            if augmented:
+                block = augment(block, rng)
+            yield block, labels[start:stop][mask].astype(np.int32)
+
+
+def make_datasets(data_dir, batch_size=32, val_fraction=0.2, shuffle_buffer=16384, seed=42,
+                  normalized=False, augmented=False):
+    """Build (train, validation, label_names) tf.data pipelines with integer labels.
+
+    ``normalized`` applies preprocessing.normalize to both splits; ``augmented``
+    adds random rotation, scale and jitter to the training split only.
+    """
+    pairs = shard_paths(data_dir)
+    if not pairs:
+        raise FileNotFoundError(f"No landmark shards found in {data_dir}")
+    label_names = load_meta(data_dir)['labels']
+    signature = (tf.TensorSpec((None, NUM_FEATURES), tf.float32), tf.TensorSpec((None,), tf.int32))
+
+    def split(validation):
+        epoch = {'n': 0}
+
+        def generator():
+            # A different shard order every epoch for the training split
+            epoch['n'] += 1
+            yield from _blocks(pairs, validation, val_fraction, not validation, seed + epoch['n'],
+                               normalized, augmented and not validation)
+
+        ds = tf.data.Dataset.from_generator(generator, output_signature=signature).unbatch()
+        if not validation:
+            ds = ds.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+        return ds.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+    return split(False), split(True), label_names
@@ -0,0 +1,134 @@
+import os
+import sys
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 3
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+
+def use_backend():
+    """Make the backend modules (model_registry, metrics, tracking, main) importable from here."""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+
+def model_registry():
+    """The process-wide model registry (backend/model_registry.py)."""
+    use_backend()
+    import model_registry
+
+    return model_registry
+
+
+def variant_path(model_path, variant):
+    """asl_dense.tflite + 'int8' -> asl_dense_int8.tflite; 'float32' or empty keeps the base model."""
+    if not variant or variant == 'float32':
+        return model_path
+    root, ext = os.path.splitext(model_path)
+    return f"{root}_{variant}{ext}"
+
+
+def landmarks_into(hand, out):
+    """Write the x, y, z of a MediaPipe hand's 21 landmarks into ``out`` (63 float32) in place."""
+    i = 0
+    for lm in hand.landmark:
+        out[i] = lm.x
+        out[i + 1] = lm.y
+        out[i + 2] = lm.z
+        i += 3
+    return out
+
+
+class LandmarkBufferPool:
+    """A small ring of preallocated (max_hands, 63) float32 buffers for handing landmarks between threads.
+
+    With latest-wins queues at most one buffer is being filled, one is waiting
+    and one is being read, so a ring of four is never overwritten while in use.
+    """
+
+    def __init__(self, size=4, max_hands=1):
+        self._buffers = np.zeros((size, max_hands, NUM_FEATURES), dtype=np.float32)
+        self._next = 0
+
+    def next(self):
+        buf = self._buffers[self._next]
+        self._next = (self._next + 1) % len(self._buffers)
+        return buf
+
+
+class StaticClassifier:
+    """asl_dense TFLite interpreter fed through its own input tensor view.
+
+    Landmarks are copied straight into the interpreter's input buffer and the
+    output is read from its output buffer, so classifying a frame allocates no
+    intermediate arrays. The input is resized once to ``max_batch`` rows so up
+    to that many hands share a single invoke(). If the model was trained on
+    normalized landmarks (see preprocessing.py), normalization is written
+    straight into the input tensor as well. The interpreter comes from the
+    model registry, so classifiers of the same model and batch size share one
+    warmed-up interpreter; it is not thread-safe and calls are serialized.
+    """
+
+    def __init__(self, model_path='asl_dense.tflite', max_batch=1):
+        # Imported here to avoid a cycle: preprocessing imports the landmark constants
+        from preprocessing import load_config, normalize
+
+        self._normalize = normalize
+        config = load_config(model_path)
+        self.normalize = config['normalize']
+        self.mirror_left = config['mirror_left']
+
+        handle = model_registry().tflite_interpreter(model_path, batch=max_batch)
+        self.interpreter = handle.model
+        self.max_batch = max_batch
+        input_idx = self.interpreter.get_input_details()[0]['index']
+        output_idx = self.interpreter.get_output_details()[0]['index']
+        # Callables returning views into the interpreter's tensors; never hold the view across invoke()
+        self._input = self.interpreter.tensor(input_idx)
+        self._output = self.interpreter.tensor(output_idx)
+        self.lock = handle.lock
+
+    def _fill_input(self, landmarks, handedness):
+        n = len(landmarks)
+        if not self.normalize:
+            self._input()[:n] = landmarks
+            return
+
+        is_left = None
+        if self.mirror_left and handedness is not None:
+            is_left = [side == 'Left' for side in handedness]
+        self._normalize(landmarks, is_left, out=self._input()[:n])
+
+    def classify(self, landmarks, out=None, handedness=None):
+        """Class probabilities for one 63-value vector, written into ``out`` if given."""
+        with self.lock:
+            self._fill_input(np.reshape(landmarks, (1, NUM_FEATURES)),
+                             None if handedness is None else [handedness])
+            self.interpreter.invoke()
+            probs = self._output()[0]
+            if out is None:
+                return probs.copy()
+            np.copyto(out, probs)
+            return out
+
+    def classify_batch(self, landmarks, out=None, handedness=None):
+        """Probabilities for an (N, 63) batch with N <= max_batch, in one invoke().
+
+        ``handedness`` lists 'Left'/'Right' per row, used to mirror left hands
+        when the model expects it.
+        """
+        n = len(landmarks)
+        if n > self.max_batch:
+            raise ValueError(f"Batch of {n} hands exceeds max_batch={self.max_batch}")
+        with self.lock:
+            # Rows past n keep stale values; their outputs are ignored
+            self._fill_input(landmarks, handedness)
+            self.interpreter.invoke()
+            probs = self._output()[:n]
+            if out is None:
+                return probs.copy()
+            np.copyto(out, probs)
+            return out
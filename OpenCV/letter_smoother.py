@@ -0,0 +1,121 @@
+import numpy as np
+
+SMOOTHING_MODES = ('average', 'majority')
+
+
+class LetterSmoother:
+    """Turns a stream of per-frame class probabilities into committed letters.
+
+    The last ``window`` frames live in preallocated ring buffers. A letter is
+    committed once the smoothed winner (probability average or majority vote)
+    has stayed the same for ``hold_frames`` consecutive frames with at least
+    ``min_confidence``. The same letter is not committed twice in a row until
+    release() is called (e.g. the hand left the frame).
+    """
+
+    def __init__(self, num_classes, window=10, hold_frames=8, min_confidence=0.6, mode='average'):
+        if mode not in SMOOTHING_MODES:
+            raise ValueError(f"Unknown smoothing mode '{mode}', expected one of {SMOOTHING_MODES}")
+        self.num_classes = num_classes
+        self.window = window
+        self.hold_frames = hold_frames
+        self.min_confidence = min_confidence
+        self.mode = mode
+
+        self._probs = np.zeros((window, num_classes), dtype=np.float32)
+        self._votes = np.zeros(window, dtype=np.int64)
+        self._scores = np.zeros(num_classes, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self._probs.fill(0.0)
+        self._pos = 0
+        self._count = 0
+        self._candidate = -1
+        self._held = 0
+        self._last_committed = -1
+
+    def release(self):
+        """Forget the window and allow the last letter to be committed again."""
+        self.reset()
+
+    def update(self, probs):
+        """Add one frame of probabilities; returns a committed class index or None."""
+        self._probs[self._pos] = probs
+        self._votes[self._pos] = int(np.argmax(probs))
+        self._pos = (self._pos + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+
+        if self.mode == 'average':
+            # Unfilled rows are zero, so summing the whole ring is exact
+            np.sum(self._probs, axis=0, out=self._scores)
+        else:
+            self._scores.fill(0.0)
+            np.add.at(self._scores, self._votes[:self._count], 1.0)
+        self._scores /= self._count
+
+        winner = int(np.argmax(self._scores))
+        if winner != self._candidate:
+            self._candidate = winner
+            self._held = 0
+        self._held += 1
+
+        if (self._held >= self.hold_frames and self._scores[winner] >= self.min_confidence
+                and winner != self._last_committed):
+            self._last_committed = winner
+            return winner
+        return None
+
+
+class HandSmoothers:
+    """One LetterSmoother per hand, with hands matched to smoothers by wrist position.
+
+    MediaPipe's handedness label is unreliable (both hands often get the same
+    one), so it can't key the smoothers. Instead every frame each hand takes
+    the smoother whose last wrist position is nearest, closest pairs first.
+    A hand further than ``max_distance`` (normalized image units) from every
+    tracked wrist starts a fresh smoother, and smoothers left without a hand
+    are released.
+    """
+
+    def __init__(self, num_classes, max_hands=2, max_distance=0.2, **options):
+        self.max_distance = max_distance
+        self._smoothers = [LetterSmoother(num_classes, **options) for _ in range(max_hands)]
+        # Last wrist (x, y) per smoother; NaN while it has no hand
+        self._wrists = np.full((max_hands, 2), np.nan, dtype=np.float32)
+
+    def __getitem__(self, slot):
+        return self._smoothers[slot]
+
+    def reset(self):
+        for smoother in self._smoothers:
+            smoother.reset()
+        self._wrists.fill(np.nan)
+
+    def assign(self, wrists):
+        """Smoother slot for each (x, y) wrist of this frame; every other smoother is released."""
+        wrists = np.asarray(wrists, dtype=np.float32).reshape(-1, 2)
+        if len(wrists) > len(self._smoothers):
+            raise ValueError(f"{len(wrists)} hands but only {len(self._smoothers)} smoothers")
+        slots = [-1] * len(wrists)
+        free = list(range(len(self._smoothers)))
+        if len(wrists):
+            dist = np.linalg.norm(wrists[:, None, :] - self._wrists[None, :, :], axis=2)
+            # NaN (untracked smoother) sorts last, so the loop stops at the first pair out of range
+            for flat in np.argsort(dist, axis=None):
+                hand, slot = divmod(int(flat), len(self._smoothers))
+                if not dist[hand, slot] <= self.max_distance:
+                    break
+                if slots[hand] == -1 and slot in free:
+                    slots[hand] = slot
+                    free.remove(slot)
+            for hand in range(len(wrists)):
+                if slots[hand] == -1:
+                    # A new hand: start from an empty window
+                    slots[hand] = free.pop(0)
+                    self._smoothers[slots[hand]].release()
+                self._wrists[slots[hand]] = wrists[hand]
+        for slot in free:
+            self._smoothers[slot].release()
+            self._wrists[slot] = np.nan
+        return slots
@@ -0,0 +1,103 @@
+import numpy as np
+
+from landmarks import model_registry
+
+MOTION_LABELS = ['J', 'Z']
+TRAJECTORY_LENGTH = 15
+
+
+class TrajectoryRing:
+    """Fixed-size ring of (x, y) fingertip positions with a running motion-energy sum.
+
+    Motion energy is the fingertip's total path length over the last ``length``
+    moves, updated in O(1) per push, so deciding whether the hand is moving
+    costs nothing per frame.
+    """
+
+    def __init__(self, length=TRAJECTORY_LENGTH):
+        self.length = length
+        self._points = np.zeros((length, 2), dtype=np.float32)
+        self._steps = np.zeros(length, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self._pos = 0
+        self._count = 0
+        self._steps.fill(0.0)
+        self.energy = 0.0
+
+    def __len__(self):
+        return self._count
+
+    def is_full(self):
+        return self._count == self.length
+
+    def push(self, x, y):
+        if self._count:
+            prev = self._points[(self._pos - 1) % self.length]
+            step = float(np.hypot(x - prev[0], y - prev[1]))
+        else:
+            step = 0.0
+        if self._count == self.length:
+            # The oldest point is overwritten, so the step out of it leaves the window
+            nxt = (self._pos + 1) % self.length
+            self.energy -= float(self._steps[nxt])
+            self._steps[nxt] = 0.0
+        self.energy += step
+        self._steps[self._pos] = step
+        self._points[self._pos] = (x, y)
+        self._pos = (self._pos + 1) % self.length
+        self._count = min(self._count + 1, self.length)
+
+    def ordered_into(self, out):
+        """Write the trajectory oldest-first into ``out`` (length*2 floats: x0, y0, x1, y1, ...)."""
+        out = out.reshape(self.length, 2)
+        head = self.length - self._pos
+        out[:head] = self._points[self._pos:]
+        out[head:] = self._points[:self._pos]
+
+
+class MotionClassifier:
+    """Runs the learned J/Z model over a TrajectoryRing, gated on motion energy.
+
+    The model only runs when the ring is full and the fingertip travelled at
+    least ``energy_threshold`` (in normalized image units) over the window, so a
+    still hand costs one ring push per frame. After a confident detection the
+    ring is cleared so the same gesture isn't reported twice. The interpreter
+    comes from the model registry (which converts .h5 models once per content)
+    and is shared with other classifiers of the same model, so every invoke
+    holds the handle's lock.
+    """
+
+    def __init__(self, model_path='motion_model_jz.h5', energy_threshold=0.25, min_confidence=0.8,
+                 length=TRAJECTORY_LENGTH):
+        handle = model_registry().tflite_interpreter(model_path)
+        self.interpreter = handle.model
+        self.lock = handle.lock
+        self._input = self.interpreter.tensor(self.interpreter.get_input_details()[0]['index'])
+        self._output = self.interpreter.tensor(self.interpreter.get_output_details()[0]['index'])
+        self.energy_threshold = energy_threshold
+        self.min_confidence = min_confidence
+        self.ring = TrajectoryRing(length)
+        self.invocations = 0
+
+    def update(self, x, y):
+        """Push one fingertip position; returns 'J', 'Z' or None."""
+        self.ring.push(x, y)
+        if not self.ring.is_full() or self.ring.energy < self.energy_threshold:
+            return None
+
+        with self.lock:
+            self.ring.ordered_into(self._input()[0])
+            self.interpreter.invoke()
+            probs = self._output()[0]
+            idx = int(np.argmax(probs))
+            confidence = float(probs[idx])
+        self.invocations += 1
+        if confidence < self.min_confidence:
+            return None
+        self.ring.reset()
+        return MOTION_LABELS[idx]
+
+    def reset(self):
+        self.ring.reset()
@@ -0,0 +1,78 @@
+# preprocessing.py
+#
+# Landmark normalization and augmentation shared by training (train_model.py,
+# landmark_dataset.py) and inference (landmarks.StaticClassifier). Everything is
+# vectorized over (N, 63) batches.
+
+import json
+import os
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, NUM_FEATURES
+
+WRIST = 0
+MIDDLE_MCP = 9
+
+
+def normalize(landmarks, is_left=None, out=None):
+    """Wrist-centered, palm-scale-normalized landmarks, with left hands mirrored to right.
+
+    ``landmarks`` is (N, 63) or (63,) in MediaPipe x0, y0, z0, x1, ... order.
+    Every point is made relative to the wrist and divided by the wrist to
+    middle-finger-MCP distance in the image plane, so hand position and size no
+    longer matter. ``is_left`` is an optional (N,) bool mask of hands to mirror
+    along x. Pass ``out`` (N, 63) float32 to avoid allocating the result.
+    """
+    pts = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    if out is None:
+        out = np.empty(pts.shape, dtype=np.float32)
+    else:
+        out = out.reshape(-1, NUM_LANDMARKS, 3)
+
+    np.subtract(pts, pts[:, WRIST:WRIST + 1, :], out=out)
+    scale = np.hypot(out[:, MIDDLE_MCP, 0], out[:, MIDDLE_MCP, 1])
+    np.maximum(scale, 1e-6, out=scale)
+    out /= scale[:, None, None]
+
+    if is_left is not None:
+        out[np.asarray(is_left, dtype=bool), :, 0] *= -1.0
+    return out.reshape(-1, NUM_FEATURES)
+
+
+def augment(landmarks, rng, max_rotation_deg=15.0, scale_range=(0.9, 1.1), jitter_std=0.02):
+    """Random in-plane rotation, uniform scale and per-point Gaussian jitter for a normalized batch."""
+    pts = np.array(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    n = len(pts)
+
+    theta = np.deg2rad(rng.uniform(-max_rotation_deg, max_rotation_deg, n)).astype(np.float32)
+    cos, sin = np.cos(theta)[:, None], np.sin(theta)[:, None]
+    x = pts[:, :, 0].copy()
+    y = pts[:, :, 1]
+    pts[:, :, 0] = cos * x - sin * y
+    pts[:, :, 1] = sin * x + cos * y
+
+    pts *= rng.uniform(scale_range[0], scale_range[1], n).astype(np.float32)[:, None, None]
+    pts += rng.normal(0.0, jitter_std, pts.shape).astype(np.float32)
+    return pts.reshape(-1, NUM_FEATURES)
+
+
+def config_path_for(model_path):
+    """Preprocessing settings travel with the model as <model>.json."""
+    return os.path.splitext(model_path)[0] + '.json'
+
+
+def save_config(model_path, normalized, mirror_left=False):
+    # Only set mirror_left for models whose training data was mirrored the same way;
+    # the collected datasets carry no handedness, so nothing is mirrored today
+    with open(config_path_for(model_path), 'w') as f:
+        json.dump({'normalize': normalized, 'mirror_left': mirror_left}, f)
+
+
+def load_config(model_path):
+    """Settings the model was trained with; models without a config take raw landmarks."""
+    path = config_path_for(model_path)
+    if not os.path.exists(path):
+        return {'normalize': False, 'mirror_left': False}
+    with open(path) as f:
+        return json.load(f)
@@ -1,35 +1,142 @@
+import argparse
+import queue
+import threading
+
 import cv2
 import numpy as np
 import mediapipe as mp
-from ultralytics import YOLO
-import pyttsx3
 import tkinter as tk
 from PIL import Image, ImageTk
-import threading
 
-model = YOLO("models/best.pt")
+from capture_pipeline import CapturePipeline, LatestQueue
+from landmarks import model_registry
+from letter_smoother import LetterSmoother
+
+MODEL_PATH = "models/best.pt"
 
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1, min_detection_confidence=0.5)
 mp_drawing = mp.solutions.drawing_utils
 
-engine = pyttsx3.init()
+engine = None
+_engine_lock = threading.Lock()
 
 def speak(text):
+    global engine
+    with _engine_lock:
+        if engine is None:
+            import pyttsx3
+            engine = pyttsx3.init()
     engine.say(text)
     engine.runAndWait()
 
+
+def load_yolo(model_path=MODEL_PATH, export_format=None, imgsz=640, half=False, int8=False):
+    """Load the YOLO model, optionally exporting it first (e.g. onnx/openvino/engine, FP16 or INT8)."""
+    # Ultralytics pulls in torch; imported here so it loads on the worker thread, after the window is up
+    from ultralytics import YOLO
+
+    # Shared per process and content; YoloWorker runs the warm-up at its own input size
+    model = model_registry().load('yolo', model_path, YOLO).model
+    if export_format:
+        print(f"[INFO] Exporting {model_path} to {export_format} (imgsz={imgsz}, half={half}, int8={int8})...")
+        exported = model.export(format=export_format, imgsz=imgsz, half=half, int8=int8)
+        print(f"[INFO] Exported to {exported}; pass it with --model to skip the export next time")
+        model = YOLO(exported, task='detect')
+    return model
+
+
+class YoloWorker:
+    """Runs YOLO on its own thread so the Tk event loop never waits on inference.
+
+    Explicit captures go through a FIFO so none are lost; continuous-mode frames
+    go through a latest-wins slot, so detection runs as fast as the model allows
+    and simply skips frames it can't keep up with. Results land in ``results``
+    as (mode, [(class id, confidence), ...]) for the GUI to poll.
+    """
+
+    def __init__(self, model_loader, imgsz=640, conf=0.6, half=False):
+        self.model_loader = model_loader
+        self.imgsz = imgsz
+        self.conf = conf
+        self.half = half
+        self.model = None
+        self.captures = queue.SimpleQueue()
+        self.stream = LatestQueue()
+        self.results = queue.SimpleQueue()
+        self.ready = threading.Event()
+        self.error = None
+        self.loaded = False
+        self.failures = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="yolo-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame, mode='capture'):
+        if mode == 'capture':
+            self.captures.put(frame)
+        else:
+            self.stream.put(frame)
+
+    def stop(self):
+        self._running = False
+        self._thread.join(timeout=1.0)
+
+    def predict(self, frame):
+        results = self.model.predict(source=frame, save=False, conf=self.conf, imgsz=self.imgsz,
+                                     half=self.half, verbose=False)
+        return [(int(box.cls[0]), float(box.conf[0])) for r in results for box in r.boxes]
+
+    def _run(self):
+        try:
+            self.model = self.model_loader()
+            # Warm-up: the first predict pays for graph setup and memory allocation
+            self.predict(np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8))
+            self.loaded = True
+        except Exception as e:
+            self.error = e
+            return
+        finally:
+            self.ready.set()
+
+        while self._running:
+            try:
+                frame, mode = self.captures.get_nowait(), 'capture'
+            except queue.Empty:
+                frame, mode = self.stream.get(timeout=0.02), 'continuous'
+            if frame is None:
+                continue
+            # One failed inference skips that frame; the GUI shows the error until one succeeds
+            try:
+                detections = self.predict(frame)
+            except Exception as e:
+                self.error = e
+                self.failures += 1
+                continue
+            self.error = None
+            self.results.put((mode, detections))
+
+
 class ASLApp:
-    def __init__(self, root):
+    def __init__(self, root, worker):
         self.root = root
         self.root.title("ASL translator")
+        self.worker = worker
 
         self.video_frame = tk.Label(self.root)
         self.video_frame.pack()
 
-        self.capture_button = tk.Button(self.root, text="Clear", command=self.clear_text)
+        self.status_label = tk.Label(self.root, text="Loading model...")
+        self.status_label.pack()
+
+        self.capture_button = tk.Button(self.root, text="Capture", command=self.capture_sign)
         self.capture_button.pack()
 
+        self.continuous = tk.BooleanVar(value=False)
+        self.continuous_button = tk.Checkbutton(self.root, text="Continuous", variable=self.continuous,
+                                                command=self.toggle_continuous)
+        self.continuous_button.pack()
+
         self.clear_button = tk.Button(self.root, text="Clear", command=self.clear_text)
         self.clear_button.pack()
 
@@ -42,43 +149,121 @@ class ASLApp:
         self.cap = cv2.VideoCapture(0)
         self.running = True
         self.current_frame = None
+        self.continuous_mode = False    # read by the processing thread, so not a Tk variable
+        self.smoother = None
+
+        # Capture and MediaPipe run on worker threads; the Tk timer only shows finished frames
+        self.pipeline = CapturePipeline(self.cap, self.process_frame)
+        self.pipeline.start()
 
         self.root.bind('<c>', lambda event: self.capture_sign())
         self.update_video()
 
+    def process_frame(self, frame):
+        """Runs on the pipeline's processing thread: MediaPipe, drawing and RGB conversion."""
+        raw = frame.copy()
+        if self.continuous_mode and self.worker.ready.is_set():
+            self.worker.submit(raw, mode='continuous')
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+        if results.multi_hand_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+        return raw, Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
     def update_video(self):
-        ret, frame = self.cap.read()
-        if ret:
-            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = hands.process(image_rgb)
-
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-            self.current_frame = frame.copy()
-            img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        result = self.pipeline.poll()
+        if result is not None:
+            self.current_frame, img = result
             imgtk = ImageTk.PhotoImage(image=img)
             self.video_frame.imgtk = imgtk
             self.video_frame.configure(image=imgtk)
+        self.update_status()
+        while not self.worker.results.empty():
+            self.handle_detections(*self.worker.results.get())
         if self.running:
-            self.video_frame.after(10, self.update_video)
+            self.video_frame.after(15, self.update_video)
+
+    def update_status(self):
+        if self.worker.error is not None:
+            if self.worker.loaded:
+                self.status_label.configure(
+                    text=f"Detection failed ({self.worker.failures} so far): {self.worker.error}")
+            else:
+                self.status_label.configure(text=f"Model failed to load: {self.worker.error}")
+        elif self.worker.ready.is_set():
+            stats = self.pipeline.timings.format()
+            if self.pipeline.errors:
+                stats += f" | {self.pipeline.errors} failed frames, last: {self.pipeline.last_error}"
+            self.status_label.configure(text=f"Ready | {stats}" if stats else "Ready")
+
+    def handle_detections(self, mode, detections):
+        names = self.worker.model.names
+        if mode == 'capture':
+            for cls_id, _ in detections:
+                self.add_label(names[cls_id])
+            return
+        if not self.continuous_mode:
+            return
+        # Continuous mode: only commit a label once it has been stable for a few detections
+        if self.smoother is None:
+            self.smoother = LetterSmoother(len(names), window=6, hold_frames=4, mode='majority')
+        if not detections:
+            self.smoother.release()
+            return
+        cls_id, conf = max(detections, key=lambda d: d[1])
+        probs = np.zeros(len(names), dtype=np.float32)
+        probs[cls_id] = conf
+        committed = self.smoother.update(probs)
+        if committed is not None:
+            self.add_label(names[committed])
+
+    def add_label(self, label):
+        self.text_display.insert(tk.END, label + ' ')
+        threading.Thread(target=speak, args=(label,)).start()
+
     def capture_sign(self):
-        if self.current_frame is not None:
-            results = model.predict(source=self.current_frame, save =False, conf=0.6)
-            for r in results:
-                for box in r.boxes:
-                    cls_id = int(box.cls[0])
-                    label = model.names[cls_id]
-                    self.text_display.insert(tk.END, label + ' ')
-                    threading.Thread(target=speak, args=(label,)).start()
+        if self.current_frame is not None and self.worker.ready.is_set():
+            self.worker.submit(self.current_frame, mode='capture')
+
+    def toggle_continuous(self):
+        self.continuous_mode = self.continuous.get()
+        if self.smoother is not None:
+            self.smoother.release()
+
     def clear_text(self):
         self.text_display.delete(1.0, tk.END)
-    
+
     def exit_app(self):
         self.running = False
+        self.pipeline.stop()
+        self.worker.stop()
         self.cap.release()
         self.root.destroy()
-if __name__ == "__main__":
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO-based ASL translator")
+    parser.add_argument('--model', default=MODEL_PATH, help="YOLO weights or an exported model")
+    parser.add_argument('--imgsz', type=int, default=640, help="Inference input size (smaller is faster)")
+    parser.add_argument('--conf', type=float, default=0.6)
+    parser.add_argument('--half', action='store_true', help="FP16 inference/export")
+    parser.add_argument('--int8', action='store_true', help="INT8 export (needs --export)")
+    parser.add_argument('--export', metavar='FORMAT', help="Export before running, e.g. onnx, openvino, engine")
+    parser.add_argument('--continuous', action='store_true', help="Start in continuous-detection mode")
+    args = parser.parse_args()
+    if args.int8 and not args.export:
+        parser.error("--int8 only applies to exported models; add --export FORMAT")
+
+    # The model loads and warms up on the worker thread while the window comes up
+    worker = YoloWorker(lambda: load_yolo(args.model, args.export, args.imgsz, args.half, args.int8),
+                        imgsz=args.imgsz, conf=args.conf, half=args.half and not args.export)
     root = tk.Tk()
-    app = ASLApp(root)
-    root.mainloop()
\ No newline at end of file
+    app = ASLApp(root, worker)
+    app.continuous.set(args.continuous)
+    app.toggle_continuous()
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# sweep.py
+#
+# Parallel hyperparameter sweep for the landmark classifiers. Every configuration
+# trains in its own process with a capped TensorFlow thread count; the dataset is
+# written once as .npy files and memory-mapped by every worker, so the OS page
+# cache holds one shared copy. Results are ranked on accuracy and TFLite latency.
+
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
+def load_static(args):
+    """asl_dense training data: shards (or the CSV) with the model's preprocessing, split at random."""
+    from preprocessing import normalize
+
+    if os.path.isdir(args.shards):
+        from dataset_writer import load_dataset
+
+        X, y, label_names = load_dataset(args.shards)
+        X, y = np.array(X, dtype=np.float32), np.asarray(y, dtype=np.int32)
+        num_classes = len(label_names)
+    else:
+        import pandas as pd
+
+        df = pd.read_csv(args.csv)
+        X = df.drop('label', axis=1).values.astype('float32')
+        y = df['label'].map(lambda letter: ord(letter) - 65).values.astype(np.int32)
+        num_classes = 26
+    if not args.raw:
+        X = normalize(X, out=X)
+    # Samples are independent frames, so a row-wise shuffle split is fine here
+    order = np.random.default_rng(42).permutation(len(y))
+    cut = int(len(y) * (1 - args.val_fraction))
+    return (X[order[:cut]], y[order[:cut]]), (X[order[cut:]], y[order[cut:]]), num_classes
+
+
+def load_motion(args):
+    """J/Z windows cut from the stored trajectories at --stride, split per recording.
+
+    Overlapping windows of one recording must not land on both sides, so the
+    split is the one train_motion.py uses: whole recordings are held out.
+    """
+    from train_motion import MOTION_DIR, load_motion_windows
+
+    windows, (train_starts, train_labels), (val_starts, val_labels), label_names = \
+        load_motion_windows(MOTION_DIR, stride=args.stride, val_fraction=args.val_fraction)
+    return ((windows[train_starts], train_labels), (windows[val_starts], val_labels), len(label_names))
+
+
+TASKS = {
+    'static': load_static,
+    'motion': load_motion,
+}
+
+
+def write_split(train, val, tmp):
+    """Save the train and validation arrays as .npy files the workers memory-map."""
+    paths = {}
+    for name, (X, y) in (('train', train), ('val', val)):
+        paths[name] = (os.path.join(tmp, f'{name}_X.npy'), os.path.join(tmp, f'{name}_y.npy'))
+        np.save(paths[name][0], np.ascontiguousarray(X, dtype=np.float32))
+        np.save(paths[name][1], np.ascontiguousarray(y, dtype=np.int32))
+    return paths
+
+
+def _init_worker(threads):
+    os.environ['TF_NUM_INTRAOP_THREADS'] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _batches(X, y, batch_size, seed):
+    """tf.data over memory-mapped arrays, reshuffled every epoch; only each batch's rows are copied."""
+    import tensorflow as tf
+
+    # One RNG per dataset, not per generator() call, so each epoch sees a new order
+    rng = np.random.default_rng(seed)
+
+    def generator():
+        order = rng.permutation(len(y))
+        for start in range(0, len(y), batch_size):
+            idx = np.sort(order[start:start + batch_size])
+            yield X[idx], y[idx]
+
+    signature = (tf.TensorSpec((None, X.shape[1]), tf.float32), tf.TensorSpec((None,), tf.int32))
+    return tf.data.Dataset.from_generator(generator, output_signature=signature).prefetch(2)
+
+
+def tflite_latency_ms(model, sample, invokes=500):
+    import tensorflow as tf
+
+    interpreter = tf.lite.Interpreter(model_content=tf.lite.TFLiteConverter.from_keras_model(model).convert())
+    interpreter.allocate_tensors()
+    input_idx = interpreter.get_input_details()[0]['index']
+    interpreter.set_tensor(input_idx, sample[np.newaxis])
+    interpreter.invoke()
+    times = []
+    for _ in range(invokes):
+        start = time.perf_counter()
+        interpreter.invoke()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+
+def train_config(config, paths, num_classes):
+    from train_model import build_model
+
+    X_train, y_train = (np.load(p, mmap_mode='r') for p in paths['train'])
+    X_val, y_val = (np.load(p, mmap_mode='r') for p in paths['val'])
+
+    start = time.perf_counter()
+    model = build_model(num_classes, sparse=True, hidden=config['hidden'], input_dim=X_train.shape[1],
+                        dropout=config['dropout'], learning_rate=config['lr'])
+    model.fit(_batches(X_train, y_train, config['batch_size'], seed=0), epochs=config['epochs'], verbose=0)
+    train_s = time.perf_counter() - start
+
+    _, acc = model.evaluate(_batches(X_val, y_val, 1024, seed=0), verbose=0)
+    latency = tflite_latency_ms(model, np.asarray(X_val[0], dtype=np.float32))
+    return dict(config, accuracy=float(acc), latency_ms=latency, params=int(model.count_params()),
+                train_s=round(train_s, 1))
+
+
+def pareto(results):
+    """Mark configs no other config beats on both accuracy and latency."""
+    for r in results:
+        r['pareto'] = not any(o['accuracy'] >= r['accuracy'] and o['latency_ms'] <= r['latency_ms']
+                              and (o['accuracy'] > r['accuracy'] or o['latency_ms'] < r['latency_ms'])
+                              for o in results)
+
+
+def parse_list(text, cast):
+    return [cast(v) for v in text.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep for the landmark classifiers")
+    parser.add_argument('--task', choices=sorted(TASKS), default='static')
+    parser.add_argument('--shards', default='data/landmarks')
+    parser.add_argument('--csv', default='data/landmarks.csv')
+    parser.add_argument('--raw', action='store_true', help="Sweep on raw instead of normalized landmarks")
+    parser.add_argument('--stride', type=int, default=1, help="Window stride for the motion task")
+    parser.add_argument('--val-fraction', type=float, default=0.2)
+    parser.add_argument('--hidden', default='128,64;64,32;32,16;64;32',
+                        help="Semicolon-separated architectures, each a comma-separated list of layer sizes")
+    parser.add_argument('--dropouts', default='0.0,0.3')
+    parser.add_argument('--lrs', default='0.001,0.003')
+    parser.add_argument('--batch-sizes', default='32,128')
+    parser.add_argument('--epochs', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=max(1, mp.cpu_count() // 2))
+    parser.add_argument('--threads-per-worker', type=int, default=2)
+    parser.add_argument('--latency-weight', type=float, default=0.05,
+                        help="Score = accuracy - weight * latency_ms, used for the ranking")
+    parser.add_argument('-o', '--output', default='sweep_results.json')
+    args = parser.parse_args()
+
+    train, val, num_classes = TASKS[args.task](args)
+    if not len(train[1]) or not len(val[1]):
+        # Every config would fail on evaluate() / the latency sample, so stop before spawning workers
+        parser.error(f"The {args.task} task has {len(train[1])} training and {len(val[1])} validation samples; "
+                     f"both splits need data (record more, or adjust --val-fraction)")
+    configs = [
+        {'hidden': hidden, 'dropout': dropout, 'lr': lr, 'batch_size': batch_size, 'epochs': args.epochs}
+        for hidden, dropout, lr, batch_size in itertools.product(
+            [tuple(parse_list(h, int)) for h in args.hidden.split(';')],
+            parse_list(args.dropouts, float), parse_list(args.lrs, float), parse_list(args.batch_sizes, int))
+    ]
+    print(f"[INFO] {len(configs)} configurations on {len(train[1])} training / {len(val[1])} validation "
+          f"samples, {args.workers} workers x {args.threads_per_worker} threads")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_split(train, val, tmp)
+        del train, val
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=mp.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(args.threads_per_worker,)) as pool:
+            futures = [pool.submit(train_config, config, paths, num_classes) for config in configs]
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Configuration failed: {str(e)}")
+                    continue
+                results.append(result)
+                print(f"[INFO] {result['hidden']} dropout={result['dropout']} lr={result['lr']} "
+                      f"bs={result['batch_size']}: acc {result['accuracy']:.4f}, {result['latency_ms']:.4f} ms")
+
+    pareto(results)
+    for r in results:
+        r['score'] = r['accuracy'] - args.latency_weight * r['latency_ms']
+    results.sort(key=lambda r: r['score'], reverse=True)
+
+    print(f"\n{'rank':>4} {'hidden':<14} {'drop':>5} {'lr':>7} {'bs':>4} {'params':>7} "
+          f"{'accuracy':>9} {'ms':>8} {'score':>7} pareto")
+    for rank, r in enumerate(results, 1):
+        print(f"{rank:>4} {','.join(map(str, r['hidden'])):<14} {r['dropout']:>5} {r['lr']:>7} "
+              f"{r['batch_size']:>4} {r['params']:>7} {r['accuracy']:>9.4f} {r['latency_ms']:>8.4f} "
+              f"{r['score']:>7.4f} {'*' if r['pareto'] else ''}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n[INFO] Leaderboard written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
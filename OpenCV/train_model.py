@@ -1,53 +1,139 @@
 # train_model.py
 
+import argparse
+import os
+import time
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 import tensorflow as tf
 
-# 1) Load the CSV
-df = pd.read_csv('data/landmarks.csv')
-
-# 2) Split features and labels
-X = df.drop('label', axis=1).values.astype('float32')        # shape: (N, 63)
-y = pd.get_dummies(df['label']).values.astype('float32')      # shape: (N, 26)
-
-# 3) Train/test split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-
-# 4) Build a small dense network
-model = tf.keras.Sequential([
-    tf.keras.layers.Input(shape=(63,)),
-    tf.keras.layers.Dense(128, activation='relu'),
-    tf.keras.layers.Dropout(0.3),
-    tf.keras.layers.Dense(64, activation='relu'),
-    tf.keras.layers.Dense(26, activation='softmax'),
-])
-
-model.compile(
-    optimizer='adam',
-    loss='categorical_crossentropy',
-    metrics=['accuracy']
-)
-
-# 5) Train
-history = model.fit(
-    X_train, y_train,
-    validation_data=(X_test, y_test),
-    epochs=30,
-    batch_size=32
-)
-
-# 6) Evaluate
-loss, acc = model.evaluate(X_test, y_test, verbose=0)
-print(f"\nTest Accuracy: {acc*100:.2f}%")
-
-# 7) Save both Keras and TFLite versions
-model.save('asl_dense.h5')
-converter = tf.lite.TFLiteConverter.from_keras_model(model)
-tflite_model = converter.convert()
-with open('asl_dense.tflite', 'wb') as f:
-    f.write(tflite_model)
-print("Saved: asl_dense.h5 and asl_dense.tflite")
+from preprocessing import normalize, save_config
+
+CSV_PATH = 'data/landmarks.csv'
+SHARD_DIR = 'data/landmarks'
+
+
+class EpochTimer(tf.keras.callbacks.Callback):
+    """Records wall-clock seconds per epoch."""
+
+    def on_train_begin(self, logs=None):
+        self.times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.times.append(time.perf_counter() - self._start)
+
+
+def build_model(num_classes=26, sparse=True, hidden=(128, 64), input_dim=63, dropout=0.3, learning_rate=0.001):
+    # A small dense network; normalized inputs get by with fewer/narrower layers
+    layers = [tf.keras.layers.Input(shape=(input_dim,)), tf.keras.layers.Dense(hidden[0], activation='relu')]
+    if dropout > 0:
+        layers.append(tf.keras.layers.Dropout(dropout))
+    layers += [tf.keras.layers.Dense(units, activation='relu') for units in hidden[1:]]
+    layers.append(tf.keras.layers.Dense(num_classes, activation='softmax'))
+    model = tf.keras.Sequential(layers)
+
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+        loss='sparse_categorical_crossentropy' if sparse else 'categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    return model
+
+
+def train_from_csv(csv_path, epochs, batch_size, timer, normalized=False, hidden=(128, 64)):
+    """Original in-memory path: whole CSV in RAM with a dense one-hot label matrix."""
+    # 1) Load the CSV
+    df = pd.read_csv(csv_path)
+
+    # 2) Split features and labels
+    X = df.drop('label', axis=1).values.astype('float32')        # shape: (N, 63)
+    y = pd.get_dummies(df['label']).values.astype('float32')      # shape: (N, 26)
+    if normalized:
+        X = normalize(X, out=X)
+
+    # 3) Train/test split
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    # 4) Build and train
+    model = build_model(y.shape[1], sparse=False, hidden=hidden)
+    model.fit(
+        X_train, y_train,
+        validation_data=(X_test, y_test),
+        epochs=epochs,
+        batch_size=batch_size,
+        callbacks=[timer]
+    )
+    loss, acc = model.evaluate(X_test, y_test, verbose=0)
+    return model, acc
+
+
+def train_from_shards(shard_dir, epochs, batch_size, timer, normalized=False, augmented=False, hidden=(128, 64)):
+    """Streaming path: memory-mapped float32 shards through tf.data with integer labels."""
+    from landmark_dataset import make_datasets
+
+    train_ds, val_ds, label_names = make_datasets(shard_dir, batch_size=batch_size,
+                                                  normalized=normalized, augmented=augmented)
+    model = build_model(len(label_names), sparse=True, hidden=hidden)
+    model.fit(train_ds, validation_data=val_ds, epochs=epochs, callbacks=[timer])
+    loss, acc = model.evaluate(val_ds, verbose=0)
+    return model, acc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the asl_dense static letter classifier")
+    parser.add_argument('--source', choices=['auto', 'shards', 'csv'], default='auto',
+                        help="auto uses the binary shards when present, else the CSV")
+    parser.add_argument('--epochs', type=int, default=30)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--raw', action='store_true',
+                        help="Train on raw MediaPipe coordinates instead of normalized landmarks")
+    parser.add_argument('--augment', action='store_true',
+                        help="Random rotation/scale/jitter on training batches (shards only)")
+    parser.add_argument('--hidden', default='128,64', help="Comma-separated hidden layer sizes")
+    parser.add_argument('--no-save', action='store_true', help="Skip writing asl_dense.h5/.tflite")
+    args = parser.parse_args()
+    normalized = not args.raw
+    hidden = tuple(int(units) for units in args.hidden.split(','))
+
+    source = args.source
+    if source == 'auto':
+        source = 'shards' if os.path.isdir(SHARD_DIR) else 'csv'
+
+    timer = EpochTimer()
+    if source == 'shards':
+        model, acc = train_from_shards(SHARD_DIR, args.epochs, args.batch_size, timer,
+                                       normalized=normalized, augmented=args.augment, hidden=hidden)
+    else:
+        model, acc = train_from_csv(CSV_PATH, args.epochs, args.batch_size, timer,
+                                    normalized=normalized, hidden=hidden)
+
+    # Evaluate
+    print(f"\nTest Accuracy: {acc*100:.2f}%")
+    # Skip the first epoch, which includes tracing and pipeline warm-up
+    steady = timer.times[1:] or timer.times
+    print(f"Input source: {source}, mean epoch time: {np.mean(steady):.2f}s")
+
+    if args.no_save:
+        return
+
+    # Save both Keras and TFLite versions
+    model.save('asl_dense.h5')
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    tflite_model = converter.convert()
+    with open('asl_dense.tflite', 'wb') as f:
+        f.write(tflite_model)
+    # Tells StaticClassifier which preprocessing the model expects; training never
+    # mirrors left hands, so inference mustn't either
+    save_config('asl_dense.tflite', normalized, mirror_left=False)
+    print("Saved: asl_dense.h5, asl_dense.tflite and asl_dense.json")
+
+
+if __name__ == "__main__":
+    main()
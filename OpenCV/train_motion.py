@@ -0,0 +1,77 @@
+# train_motion.py
+#
+# Trains the J/Z motion model from the trajectories DynamicTrain.py stored in
+# data/motion. Points stay memory-mapped; windows are sliced out of them as a
+# zero-copy view and only each batch is gathered into memory.
+
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+from landmarks import model_registry
+from motion import TRAJECTORY_LENGTH
+from train_model import EpochTimer, build_model
+from trajectory_store import load_trajectories, window_index, window_view
+
+MOTION_DIR = 'data/motion'
+
+
+def window_dataset(windows, starts, labels, batch_size, shuffle=False, seed=42):
+    """tf.data over selected rows of the window view, reshuffled every epoch when ``shuffle``."""
+    rng = np.random.default_rng(seed)
+
+    def generator():
+        order = rng.permutation(len(starts)) if shuffle else np.arange(len(starts))
+        for i in range(0, len(order), batch_size):
+            idx = np.sort(order[i:i + batch_size])
+            yield np.asarray(windows[starts[idx]], dtype=np.float32), labels[idx]
+
+    signature = (tf.TensorSpec((None, windows.shape[1]), tf.float32), tf.TensorSpec((None,), tf.int32))
+    return tf.data.Dataset.from_generator(generator, output_signature=signature).prefetch(2)
+
+
+def load_motion_windows(data_dir, window=TRAJECTORY_LENGTH, stride=1, val_fraction=0.2):
+    """(window view, (train starts, labels), (val starts, labels), label names)."""
+    points, recordings, label_names = load_trajectories(data_dir)
+    if len(points) < window:
+        raise ValueError(f"No trajectories in {data_dir}; collect some with DynamicTrain.py first")
+    train, val = window_index(recordings, window, stride, val_fraction)
+    return window_view(points, window), train, val, label_names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the J/Z motion model from stored trajectories")
+    parser.add_argument('--data', default=MOTION_DIR)
+    parser.add_argument('--stride', type=int, default=1, help="Points between consecutive training windows")
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--hidden', default='64,32', help="Comma-separated hidden layer sizes")
+    parser.add_argument('--output', default='motion_model_jz.h5')
+    args = parser.parse_args()
+    hidden = tuple(int(units) for units in args.hidden.split(','))
+
+    windows, (train_starts, train_labels), (val_starts, val_labels), label_names = \
+        load_motion_windows(args.data, stride=args.stride)
+    print(f"[INFO] {len(train_starts)} training / {len(val_starts)} validation windows "
+          f"(window {TRAJECTORY_LENGTH}, stride {args.stride})")
+
+    train_ds = window_dataset(windows, train_starts, train_labels, args.batch_size, shuffle=True)
+    val_ds = window_dataset(windows, val_starts, val_labels, args.batch_size) if len(val_starts) else None
+
+    model = build_model(len(label_names), sparse=True, hidden=hidden, input_dim=TRAJECTORY_LENGTH * 2, dropout=0)
+    timer = EpochTimer()
+    model.fit(train_ds, validation_data=val_ds, epochs=args.epochs, callbacks=[timer])
+    if val_ds is not None:
+        loss, acc = model.evaluate(val_ds, verbose=0)
+        print(f"\nValidation Accuracy: {acc*100:.2f}%")
+
+    model.save(args.output)
+    print(f"✅ Model saved as '{args.output}'")
+
+    # The live app runs the TFLite version; convert now so its first start doesn't have to
+    print(f"✅ TFLite conversion cached as '{model_registry().converted_tflite(args.output)}'")
+
+
+if __name__ == "__main__":
+    main()
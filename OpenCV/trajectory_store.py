@@ -0,0 +1,146 @@
+# trajectory_store.py
+#
+# Append-only on-disk store for J/Z fingertip trajectories. Every recording is
+# appended as raw float32 (x, y) points to points.f32 and then described by one
+# line in recordings.jsonl; training windows are cut from the memory-mapped
+# points at load time, so any window length and stride can be used without
+# recapturing.
+
+import json
+import os
+
+import numpy as np
+
+POINTS_FILE = 'points.f32'
+INDEX_FILE = 'recordings.jsonl'
+META_FILE = 'meta.json'
+POINT_BYTES = 2 * np.dtype(np.float32).itemsize
+
+
+def count_windows(length, window, stride):
+    """Number of windows a recording of ``length`` points yields."""
+    if length < window:
+        return 0
+    return (length - window) // stride + 1
+
+
+def load_recordings(data_dir):
+    """(label index, start point, length) rows for every completed recording."""
+    index_path = os.path.join(data_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return np.empty((0, 3), dtype=np.int64)
+    with open(index_path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return np.array([(r['label'], r['start'], r['length']) for r in rows], dtype=np.int64).reshape(-1, 3)
+
+
+class TrajectoryWriter:
+    """Streams fingertip positions to disk, one recording at a time.
+
+    Points of the open recording are kept in a small growable buffer and
+    appended to points.f32 when the recording ends; the index line is written
+    afterwards, so a crash mid-write leaves no half-described recording. Any
+    unindexed tail from such a crash is truncated on the next open.
+    """
+
+    def __init__(self, data_dir, label_names):
+        self.data_dir = data_dir
+        self.label_names = list(label_names)
+        os.makedirs(data_dir, exist_ok=True)
+
+        meta_path = os.path.join(data_dir, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                if json.load(f)['labels'] != self.label_names:
+                    raise ValueError(f"{data_dir} was written with different labels")
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump({'labels': self.label_names}, f)
+
+        recordings = load_recordings(data_dir)
+        self._end = int((recordings[:, 1] + recordings[:, 2]).max()) if len(recordings) else 0
+        self._points_file = open(os.path.join(data_dir, POINTS_FILE), 'ab')
+        self._points_file.truncate(self._end * POINT_BYTES)
+        self._index_file = open(os.path.join(data_dir, INDEX_FILE), 'a')
+
+        self._buffer = np.empty((256, 2), dtype=np.float32)
+        self._count = 0
+        self._label = None
+        self.recordings = len(recordings)
+
+    def begin(self, label):
+        """Start a new recording, ending any open one."""
+        self.end()
+        self._label = self.label_names.index(label)
+        self._count = 0
+
+    def push(self, x, y):
+        if self._count == len(self._buffer):
+            self._buffer = np.concatenate([self._buffer, np.empty_like(self._buffer)])
+        self._buffer[self._count] = (x, y)
+        self._count += 1
+
+    def __len__(self):
+        """Points in the open recording."""
+        return self._count
+
+    def end(self, min_length=2):
+        """Append the open recording to the store; recordings shorter than min_length are dropped."""
+        label, count = self._label, self._count
+        self._label, self._count = None, 0
+        if label is None or count < min_length:
+            return
+        self._points_file.write(self._buffer[:count].tobytes())
+        self._points_file.flush()
+        self._index_file.write(json.dumps({'label': label, 'start': self._end, 'length': count}) + '\n')
+        self._index_file.flush()
+        self._end += count
+        self.recordings += 1
+
+    def close(self):
+        self.end()
+        self._points_file.close()
+        self._index_file.close()
+
+
+def load_trajectories(data_dir):
+    """Memory-mapped (N, 2) points, the recordings index and the label names."""
+    with open(os.path.join(data_dir, META_FILE)) as f:
+        label_names = json.load(f)['labels']
+    recordings = load_recordings(data_dir)
+    total = int((recordings[:, 1] + recordings[:, 2]).max()) if len(recordings) else 0
+    if total == 0:
+        return np.empty((0, 2), dtype=np.float32), recordings, label_names
+    points = np.memmap(os.path.join(data_dir, POINTS_FILE), dtype=np.float32, mode='r', shape=(total, 2))
+    return points, recordings, label_names
+
+
+def window_view(points, window):
+    """Zero-copy (N - window + 1, window * 2) view; row i is points[i:i + window] flattened."""
+    flat = points.reshape(-1)
+    return np.lib.stride_tricks.sliding_window_view(flat, window * 2)[::2]
+
+
+def window_index(recordings, window, stride, val_fraction=0.0):
+    """Window start points and labels for the train and validation splits.
+
+    Whole recordings are held out: every ``round(1 / val_fraction)``-th
+    recording of each label goes to validation. Overlapping windows therefore
+    never leak between the splits, and short recordings (which rarely fit a
+    window on both sides of an in-recording cut) still count.
+    """
+    every = max(2, int(round(1 / val_fraction))) if val_fraction else 0
+    seen = {}
+    splits = {False: ([], []), True: ([], [])}
+    for label, start, length in recordings:
+        nth = seen[label] = seen.get(label, 0) + 1
+        validation = bool(every) and nth % every == 0
+        n = count_windows(length, window, stride)
+        if n:
+            splits[validation][0].append(start + stride * np.arange(n))
+            splits[validation][1].append(np.full(n, label))
+    return tuple(
+        (np.concatenate(starts) if starts else np.empty(0, np.int64),
+         np.concatenate(labels).astype(np.int32) if labels else np.empty(0, np.int32))
+        for starts, labels in (splits[False], splits[True])
+    )
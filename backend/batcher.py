@@ -0,0 +1,119 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Collects inputs from concurrent callers and runs them through one forward pass.
+
+    Each caller submits an (N, ...) array and blocks on its own future. A single
+    worker thread gathers submissions until either ``max_batch_size`` rows are
+    queued or ``max_delay_ms`` has passed since the first one arrived, then calls
+    ``predict_fn`` once on the concatenated batch and hands each caller its slice.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_delay_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._rows = 0
+        self._requests = 0
+        self._last_batch_size = 0
+        self._largest_batch_size = 0
+
+        self._thread = threading.Thread(target=self._run, name="emotion-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, inputs):
+        """Queue an (N, ...) array and return a Future resolving to its N predictions."""
+        future = Future()
+        if len(inputs) == 0:
+            future.set_result(np.empty((0,), dtype=np.float32))
+            return future
+        self._queue.put((inputs, future))
+        return future
+
+    def predict(self, inputs, timeout=None):
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(inputs).result(timeout)
+
+    def stats(self):
+        """Queue depth and achieved batch sizes, for tuning throughput against tail latency."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "requests": self._requests,
+                "rows": self._rows,
+                "mean_batch_size": self._rows / self._batches if self._batches else 0.0,
+                "last_batch_size": self._last_batch_size,
+                "largest_batch_size": self._largest_batch_size,
+            }
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        """Gather submissions behind ``first`` until the batch is full or the deadline passes."""
+        pending = [first]
+        rows = len(first[0])
+        deadline = time.perf_counter() + self.max_delay
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown requested: flush what we have, then stop
+                return pending, None, True
+            if rows + len(item[0]) > self.max_batch_size:
+                # Doesn't fit; it leads the next batch instead
+                return pending, item, False
+            pending.append(item)
+            rows += len(item[0])
+        return pending, None, False
+
+    def _run(self):
+        carry = None
+        stopping = False
+        while not stopping:
+            first = carry if carry is not None else self._queue.get()
+            if first is None:
+                break
+            pending, carry, stopping = self._collect(first)
+
+            batch = np.concatenate([inputs for inputs, _ in pending], axis=0)
+            try:
+                preds = self.predict_fn(batch)
+            except Exception as e:
+                logging.error(f"Batched prediction failed for {len(batch)} rows: {str(e)}")
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for inputs, future in pending:
+                future.set_result(preds[offset:offset + len(inputs)])
+                offset += len(inputs)
+
+            with self._lock:
+                self._batches += 1
+                self._requests += len(pending)
+                self._rows += len(batch)
+                self._last_batch_size = len(batch)
+                self._largest_batch_size = max(self._largest_batch_size, len(batch))
+
+        if carry is not None:
+            carry[1].set_exception(RuntimeError("MicroBatcher closed"))
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from main import EmotionAnalyzer
+
+
+def make_frame(face_count, width=1280, height=720, face_size=120):
+    """Build a synthetic grayscale frame and a grid of face boxes laid over it."""
+    rng = np.random.default_rng(0)
+    gray = rng.integers(0, 256, size=(height, width), dtype=np.uint8)
+    cols = max(1, width // face_size)
+    faces = []
+    for i in range(face_count):
+        x = (i % cols) * face_size
+        y = (i // cols) * face_size
+        faces.append((x, y, face_size, face_size))
+    return gray, faces
+
+
+def classify_per_face(analyzer, gray, faces):
+    """The old path: one predict call per detected face."""
+    for (x, y, w, h) in faces:
+        roi = cv2.resize(gray[y:y+h, x:x+w], (64, 64)).astype(np.float32) / 255.0
+        analyzer.predict_batch(roi[np.newaxis, :, :, np.newaxis])
+
+
+def time_ms(fn, repeats):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame emotion classification latency vs face count")
+    parser.add_argument('--model', default='models/fer2013_mini_XCEPTION.102-0.66.hdf5')
+    parser.add_argument('--backend', default='keras', choices=['keras', 'function', 'tflite'])
+    parser.add_argument('--max-faces', type=int, default=10)
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    analyzer = EmotionAnalyzer(model_path=args.model, backend=args.backend)
+    if analyzer.model is None:
+        print("[ERROR] Model not loaded, nothing to benchmark.")
+        return
+
+    print(f"Backend: {args.backend}")
+    print(f"{'faces':>5} {'per-face ms':>12} {'batched ms':>12} {'speedup':>8}")
+    for n in range(1, args.max_faces + 1):
+        gray, faces = make_frame(n)
+        looped = time_ms(lambda: classify_per_face(analyzer, gray, faces), args.repeats)
+        batched = time_ms(lambda: analyzer.classify_faces(gray, faces), args.repeats)
+        print(f"{n:>5} {looped:>12.2f} {batched:>12.2f} {looped / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import io
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+RESOLUTIONS = {'720p': (1280, 720), '1080p': (1920, 1080)}
+
+
+def make_jpeg(width, height):
+    """Smooth gradients plus noise, so the JPEG is closer to a camera frame than pure noise."""
+    rng = np.random.default_rng(0)
+    xs = np.linspace(0, 255, width, dtype=np.float32)
+    ys = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    base = (xs + ys) / 2
+    image = np.stack([base, base[::-1], 255 - base], axis=-1)
+    image += rng.normal(0, 12, size=image.shape)
+    ok, buf = cv2.imencode('.jpg', np.clip(image, 0, 255).astype(np.uint8), [cv2.IMWRITE_JPEG_QUALITY, 85])
+    return buf.tobytes()
+
+
+def decode_pil_chain(data):
+    """The previous analyze_frame path: PIL -> RGB -> ndarray -> BGR -> GRAY."""
+    image = Image.open(io.BytesIO(data)).convert('RGB')
+    frame = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def decode_gray(data, flag=cv2.IMREAD_GRAYSCALE):
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+
+
+def time_ms(fn, repeats):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame decode cost of the old and new analyze_frame paths")
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    paths = [
+        ('PIL->RGB->BGR->GRAY', decode_pil_chain),
+        ('imdecode GRAYSCALE', decode_gray),
+        ('imdecode REDUCED_2', lambda d: decode_gray(d, cv2.IMREAD_REDUCED_GRAYSCALE_2)),
+        ('imdecode REDUCED_4', lambda d: decode_gray(d, cv2.IMREAD_REDUCED_GRAYSCALE_4)),
+    ]
+
+    for name, (width, height) in RESOLUTIONS.items():
+        data = make_jpeg(width, height)
+        raw = np.zeros((height, width), dtype=np.uint8)
+        print(f"\n{name} ({width}x{height}, {len(data) / 1024:.0f} KiB JPEG)")
+        baseline = None
+        for label, fn in paths:
+            ms = time_ms(lambda: fn(data), args.repeats)
+            baseline = baseline or ms
+            print(f"  {label:<22} {ms:>7.2f} ms  saves {baseline - ms:>6.2f} ms/frame")
+        ms = time_ms(lambda: np.frombuffer(memoryview(raw.data), dtype=np.uint8).reshape(height, width), args.repeats)
+        print(f"  {'raw memoryview':<22} {ms:>7.3f} ms  saves {baseline - ms:>6.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+import cv2
+
+from detectors import create_face_detector, iou
+
+# (label, detector name, options); the first entry is the reference when no annotations are given
+CONFIGS = [
+    ('haar full-res 1.1', 'haar', {}),
+    ('haar full-res 1.2', 'haar', {'scale_factor': 1.2}),
+    ('haar 640w 1.1', 'haar', {'detect_width': 640}),
+    ('haar 640w 1.2', 'haar', {'detect_width': 640, 'scale_factor': 1.2}),
+    ('haar 480w 1.3', 'haar', {'detect_width': 480, 'scale_factor': 1.3}),
+    ('dnn', 'dnn', {}),
+    ('dnn 640w', 'dnn', {'detect_width': 640}),
+]
+
+
+def load_images(image_dir):
+    images = {}
+    for path in sorted(glob.glob(os.path.join(image_dir, '*'))):
+        gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if gray is not None:
+            images[os.path.basename(path)] = gray
+    return images
+
+
+def match(predicted, truth, threshold=0.5):
+    """Greedy IoU matching; returns the number of true positives."""
+    unmatched = list(truth)
+    hits = 0
+    for box in predicted:
+        best = max(unmatched, key=lambda t: iou(box, t), default=None)
+        if best is not None and iou(box, best) >= threshold:
+            unmatched.remove(best)
+            hits += 1
+    return hits
+
+
+def run_config(detector, images):
+    results = {}
+    start = time.perf_counter()
+    for name, gray in images.items():
+        results[name] = detector.detect(gray)
+    return results, (time.perf_counter() - start) * 1000 / len(images)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Face detector accuracy vs speed on a local image set")
+    parser.add_argument('images', help="Directory of images")
+    parser.add_argument('--annotations', help="JSON mapping file name -> [[x, y, w, h], ...]; "
+                                              "defaults to the first config's output as reference")
+    args = parser.parse_args()
+
+    images = load_images(args.images)
+    if not images:
+        raise SystemExit(f"[ERROR] No readable images in {args.images}")
+
+    truth = None
+    if args.annotations:
+        with open(args.annotations) as f:
+            truth = json.load(f)
+
+    print(f"{len(images)} images, ground truth: {'annotations' if truth else CONFIGS[0][0]}")
+    print(f"{'config':<20} {'ms/img':>8} {'precision':>10} {'recall':>8} {'faces':>6}")
+    for label, name, options in CONFIGS:
+        detector = create_face_detector(name, **options)
+        if detector is None:
+            print(f"{label:<20} {'(not available)':>8}")
+            continue
+        detector.detect(next(iter(images.values())))  # warm-up
+        found, ms = run_config(detector, images)
+        if truth is None:
+            truth = found
+
+        predicted = sum(len(boxes) for boxes in found.values())
+        expected = sum(len(truth.get(n, [])) for n in images)
+        hits = sum(match(found[n], truth.get(n, [])) for n in images)
+        precision = hits / predicted if predicted else 0.0
+        recall = hits / expected if expected else 0.0
+        print(f"{label:<20} {ms:>8.2f} {precision:>10.2f} {recall:>8.2f} {predicted:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import multiprocessing as mp
+import time
+
+from pool import EmotionWorkerPool
+from replay_client import load_frames
+
+
+def run(pool, frames, total):
+    start = time.perf_counter()
+    futures = [pool.submit(frames[i % len(frames)]) for i in range(total)]
+    for future in futures:
+        future.result()
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emotion worker pool throughput from 1 to N processes")
+    parser.add_argument('--images', help="Directory of images to replay (default: synthetic frames)")
+    parser.add_argument('--max-workers', type=int, default=mp.cpu_count())
+    parser.add_argument('--frames', type=int, default=400)
+    parser.add_argument('--policy', default='least_loaded', choices=['least_loaded', 'round_robin'])
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+
+    frames = load_frames(args.images, 30, args.width, args.height)
+
+    baseline = None
+    print(f"{'workers':>7} {'frames/s':>10} {'speedup':>8} {'efficiency':>10}")
+    for n in range(1, args.max_workers + 1):
+        pool = EmotionWorkerPool(workers=n, policy=args.policy)
+        try:
+            run(pool, frames, 4 * n)  # warm-up every worker
+            fps = run(pool, frames, args.frames)
+        finally:
+            pool.close()
+        baseline = baseline or fps
+        print(f"{n:>7} {fps:>10.1f} {fps / baseline:>7.2f}x {fps / baseline / n:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import logging
+import os
+
+import cv2
+import numpy as np
+
+
+def iou(a, b):
+    """Intersection-over-union of two (x, y, w, h) boxes."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = min(ax + aw, bx + bw) - max(ax, bx)
+    ih = min(ay + ah, by + bh) - max(ay, by)
+    if iw <= 0 or ih <= 0:
+        return 0.0
+    inter = iw * ih
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+class FaceDetector:
+    """Base class: finds faces in a grayscale frame and returns (x, y, w, h) boxes.
+
+    If ``detect_width`` is set and the frame is wider, detection runs on a copy
+    downscaled to that width and the boxes are mapped back to full resolution.
+    """
+
+    name = 'base'
+
+    def __init__(self, detect_width=None):
+        self.detect_width = detect_width
+
+    def is_loaded(self):
+        return True
+
+    def detect(self, gray):
+        height, width = gray.shape[:2]
+        scale = 1.0
+        if self.detect_width and width > self.detect_width:
+            scale = width / float(self.detect_width)
+            gray = cv2.resize(gray, (self.detect_width, int(round(height / scale))), interpolation=cv2.INTER_AREA)
+
+        boxes = self._detect(gray, scale)
+        if scale == 1.0:
+            return [tuple(int(v) for v in box) for box in boxes]
+        return [tuple(int(round(v * scale)) for v in box) for box in boxes]
+
+    def _detect(self, gray, scale):
+        """Detect on ``gray``, which is the full frame shrunk by ``scale``."""
+        raise NotImplementedError
+
+
+class HaarFaceDetector(FaceDetector):
+    """OpenCV Haar cascade. A larger scale_factor means a coarser, faster pyramid."""
+
+    name = 'haar'
+
+    def __init__(self, cascade_path=None, scale_factor=1.1, min_neighbors=5, min_size=(30, 30), detect_width=None):
+        super().__init__(detect_width)
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+
+        # Use an absolute path or ensure the haarcascades are accessible
+        cascade_path = cascade_path or cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        if not os.path.exists(cascade_path):
+             logging.error(f"Face cascade file not found at {cascade_path}")
+
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            logging.error(f"Failed to load face cascade classifier from {cascade_path}.")
+        else:
+            logging.info("Face cascade classifier loaded.")
+
+    def is_loaded(self):
+        return not self.cascade.empty()
+
+    def _detect(self, gray, scale):
+        # Keep min_size meaningful in full-resolution pixels
+        min_size = (max(1, int(self.min_size[0] / scale)), max(1, int(self.min_size[1] / scale)))
+        faces = self.cascade.detectMultiScale(
+            gray,
+            scaleFactor=self.scale_factor,
+            minNeighbors=self.min_neighbors,
+            minSize=min_size,
+            flags=cv2.CASCADE_SCALE_IMAGE
+        )
+        return faces
+
+
+class DnnFaceDetector(FaceDetector):
+    """OpenCV DNN ResNet-10 SSD face detector (Caffe weights).
+
+    Slower than a coarse Haar pass on CPU but far more robust to pose and
+    lighting. Input is resized to ``input_size`` internally, so ``detect_width``
+    mostly saves the cost of that resize.
+    """
+
+    name = 'dnn'
+
+    def __init__(self, prototxt_path='models/deploy.prototxt',
+                 weights_path='models/res10_300x300_ssd_iter_140000.caffemodel',
+                 confidence=0.5, input_size=(300, 300), detect_width=None):
+        super().__init__(detect_width)
+        self.confidence = confidence
+        self.input_size = input_size
+        self.net = None
+
+        for path in (prototxt_path, weights_path):
+            if not os.path.exists(path):
+                logging.error(f"DNN face detector file not found at {path}")
+                return
+        try:
+            self.net = cv2.dnn.readNetFromCaffe(prototxt_path, weights_path)
+            logging.info("DNN face detector loaded.")
+        except cv2.error as e:
+            logging.error(f"Failed to load DNN face detector: {str(e)}")
+
+    def is_loaded(self):
+        return self.net is not None
+
+    def _detect(self, gray, scale):
+        height, width = gray.shape[:2]
+        # The network was trained on BGR; replicate the gray channel after shrinking
+        small = cv2.cvtColor(cv2.resize(gray, self.input_size), cv2.COLOR_GRAY2BGR)
+        blob = cv2.dnn.blobFromImage(small, 1.0, self.input_size, (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        out = self.net.forward()[0, 0]
+
+        out = out[out[:, 2] >= self.confidence]
+        corners = np.clip(out[:, 3:7], 0.0, 1.0) * np.array([width, height, width, height])
+        boxes = []
+        for x1, y1, x2, y2 in corners:
+            if x2 > x1 and y2 > y1:
+                boxes.append((x1, y1, x2 - x1, y2 - y1))
+        return boxes
+
+
+FACE_DETECTORS = {
+    HaarFaceDetector.name: HaarFaceDetector,
+    DnnFaceDetector.name: DnnFaceDetector,
+}
+
+
+def create_face_detector(name='haar', **options):
+    """Build a detector by name; returns None (after logging) if its model can't be loaded."""
+    if name not in FACE_DETECTORS:
+        raise ValueError(f"Unknown face detector '{name}', expected one of {tuple(FACE_DETECTORS)}")
+    detector = FACE_DETECTORS[name](**options)
+    return detector if detector.is_loaded() else None
@@ -1,23 +1,56 @@
 import cv2
 import numpy as np
 import os
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.image import img_to_array
-from PIL import Image
 import io
 import logging
+import threading
+import time
+
+import metrics
+import model_registry
+from batcher import MicroBatcher
+from detectors import FaceDetector, create_face_detector
+from tracking import FaceTracker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 'keras' = model.predict, 'function' = tf.function with a fixed input signature,
+# 'tflite' = converted TFLite interpreter (see model_registry.converted_tflite)
+INFERENCE_BACKENDS = ('keras', 'function', 'tflite')
+
+# JPEG can be decoded at 1/2, 1/4 or 1/8 size straight from the DCT coefficients
+REDUCED_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
 class EmotionAnalyzer:
-    def __init__(self, model_path='models/fer2013_mini_XCEPTION.102-0.66.hdf5'):
+    def __init__(self, model_path='models/fer2013_mini_XCEPTION.102-0.66.hdf5',
+                 batch_deadline_ms=None, max_batch_size=64, backend='keras', decode_scale=1,
+                 detector='haar', detector_options=None):
         logging.info("Initializing EmotionAnalyzer...")
-        self.model_path = model_path
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend '{backend}', expected one of {INFERENCE_BACKENDS}")
+        if decode_scale not in REDUCED_GRAYSCALE_FLAGS:
+            raise ValueError(f"decode_scale must be one of {tuple(REDUCED_GRAYSCALE_FLAGS)}, got {decode_scale}")
+        # Falls back to the shared copy in OpenCV/models when the relative path doesn't exist
+        self.model_path = model_registry.resolve(model_path)
+        self.backend = backend
+        self.decode_scale = decode_scale
+        self._warmed_up = False
         self.model = self.load_emotion_model()
-        self.face_cascade = self.load_face_cascade()
+        self.face_detector = self.load_face_detector(detector, detector_options or {})
         self.emotion_labels = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
+
+        # Optional cross-request batching: concurrent analyze_frame calls share one forward pass
+        self.batcher = None
+        if batch_deadline_ms is not None and self.model is not None:
+            self.batcher = MicroBatcher(self.predict_batch, max_batch_size=max_batch_size,
+                                        max_delay_ms=batch_deadline_ms)
+            logging.info(f"Micro-batching enabled (deadline {batch_deadline_ms} ms, max batch {max_batch_size}).")
         logging.info("EmotionAnalyzer initialization finished.")
 
 
@@ -28,9 +61,21 @@ class EmotionAnalyzer:
             return None
 
         try:
+            if self.backend == 'tflite':
+                return self.load_tflite_interpreter()
+
             logging.info("Loading model...")
-          
-            model = load_model(self.model_path)
+            # Shared with every other user of this file in the process, already warmed up
+            model = model_registry.keras_model(self.model_path).model
+            if self.backend == 'function':
+                # TensorFlow is imported on first load, not with this module
+                import tensorflow as tf
+
+                # Trace once for any batch size; skips predict()'s per-call setup
+                self._compiled_model = tf.function(
+                    lambda x: model(x, training=False),
+                    input_signature=[tf.TensorSpec(shape=(None, 64, 64, 1), dtype=tf.float32)],
+                )
 
             logging.info("Model loaded successfully.")
             return model
@@ -38,88 +83,224 @@ class EmotionAnalyzer:
             logging.error(f"Failed to load model: {str(e)}")
             return None
 
-    def load_face_cascade(self):
-        # Use an absolute path or ensure the haarcascades are accessible
-        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        if not os.path.exists(cascade_path):
-             logging.error(f"Face cascade file not found at {cascade_path}")
+    def tflite_cache_path(self):
+        return model_registry.converted_tflite(self.model_path)
+
+    def load_tflite_interpreter(self):
+        """Shared TFLite interpreter for the model, converted and cached on first use.
 
-        face_cascade = cv2.CascadeClassifier(cascade_path)
+        With an up-to-date cache only the TFLite runtime is imported, not TensorFlow.
+        """
+        self._tflite = model_registry.tflite_interpreter(self.model_path)
+        interpreter = self._tflite.model
+        self._tflite_input = interpreter.get_input_details()[0]['index']
+        self._tflite_output = interpreter.get_output_details()[0]['index']
+        logging.info("TFLite interpreter ready.")
+        return interpreter
 
-        if face_cascade.empty():
-            logging.error(f"Failed to load face cascade classifier from {cascade_path}.")
+    def load_face_detector(self, detector, options):
+        """Accepts a FaceDetector instance or a registered name ('haar', 'dnn') plus options."""
+        if isinstance(detector, FaceDetector):
+            return detector if detector.is_loaded() else None
+        try:
+            return create_face_detector(detector, **options)
+        except Exception as e:
+            logging.error(f"Failed to create face detector '{detector}': {str(e)}")
             return None
-        logging.info("Face cascade classifier loaded.")
-        return face_cascade
 
-    def analyze_frame(self, image_bytes: bytes):
-        if self.model is None or self.face_cascade is None:
-            logging.error("Model or cascade not loaded, cannot analyze frame.")
+    def predict_batch(self, rois):
+        """Run the emotion model on an (N, 64, 64, 1) float32 batch."""
+        if self.backend == 'tflite':
+            return self.invoke_tflite(rois)
+        if self.backend == 'function':
+            return self._compiled_model(rois).numpy()
+        return self.model.predict(rois, verbose=0)
+
+    def invoke_tflite(self, rois):
+        # The interpreter is shared and not thread-safe; every caller takes the handle's lock
+        with self._tflite.lock:
+            if self._tflite.shape != rois.shape:
+                # Resize only when the face count changes
+                self.model.resize_tensor_input(self._tflite_input, rois.shape)
+                self.model.allocate_tensors()
+                self._tflite.shape = rois.shape
+            self.model.set_tensor(self._tflite_input, rois)
+            self.model.invoke()
+            return self.model.get_tensor(self._tflite_output)
+
+    def warm_up(self):
+        """Run one synthetic frame through detection and the model so the first real frame isn't slow."""
+        if self._warmed_up or self.model is None or self.face_detector is None:
+            return
+        start = time.perf_counter()
+        self.face_detector.detect(np.zeros((240, 320), dtype=np.uint8))
+        self.predict_batch(np.zeros((1, 64, 64, 1), dtype=np.float32))
+        self._warmed_up = True
+        logging.info(f"EmotionAnalyzer warmed up in {(time.perf_counter() - start) * 1000:.0f} ms.")
+
+    def batching_stats(self):
+        return self.batcher.stats() if self.batcher is not None else None
+
+    def decode_frame(self, image_bytes, shape=None):
+        """Decode encoded or raw frame bytes straight to a grayscale uint8 array.
+
+        With ``shape=(height, width)`` the buffer is taken as raw 8-bit grayscale
+        and wrapped without copying. Otherwise it is decoded as JPEG/PNG directly
+        to grayscale (at 1/decode_scale size), falling back to PIL for formats
+        OpenCV can't read.
+        """
+        buf = np.frombuffer(image_bytes, dtype=np.uint8)
+        if shape is not None:
+            return buf.reshape(shape)
+
+        gray = cv2.imdecode(buf, REDUCED_GRAYSCALE_FLAGS[self.decode_scale])
+        if gray is None:
+            from PIL import Image
+
+            image = Image.open(io.BytesIO(image_bytes)).convert('L')
+            if self.decode_scale != 1:
+                image = image.reduce(self.decode_scale)
+            gray = np.asarray(image)
+        return gray
+
+    def create_tracker(self, keyframe_interval=5, **options):
+        """Per-stream tracking state: pass the result to analyze_frame(..., tracker=...) for every frame."""
+        def classify(gray, boxes):
+            kept, preds = self.predict_faces(gray, boxes)
+            by_box = dict(zip(kept, preds))
+            uniform = np.full(len(self.emotion_labels), 1.0 / len(self.emotion_labels), dtype=np.float32)
+            return [by_box.get(tuple(box), uniform) for box in boxes]
+
+        return FaceTracker(self.face_detector.detect, classify, keyframe_interval=keyframe_interval, **options)
+
+    def analyze_frame(self, image_bytes: bytes, shape=None, tracker=None):
+        # Per-stage timings (decode, detect/track, resize, predict, format) when metrics are enabled
+        with metrics.frame("emotion.frame"):
+            return self._analyze_frame(image_bytes, shape, tracker)
+
+    def _analyze_frame(self, image_bytes, shape=None, tracker=None):
+        if self.model is None or self.face_detector is None:
+            logging.error("Model or face detector not loaded, cannot analyze frame.")
             return [] # Return empty list if not initialized
 
 
         try:
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            image = image.convert('RGB')
-            frame = np.array(image)
-            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            with metrics.stage("emotion.decode"):
+                gray = self.decode_frame(image_bytes, shape)
         except Exception as e:
             logging.error(f"Failed to read or convert image bytes: {str(e)}")
             return []
 
-        if frame is None or frame.size == 0:
+        if gray is None or gray.size == 0:
              logging.error("Converted frame is empty.")
              return []
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.1,
-            minNeighbors=5,
-            minSize=(30, 30),
-            flags=cv2.CASCADE_SCALE_IMAGE 
-        )
-
-        detections = []
-        for (x, y, w, h) in faces:
-            # Extract and preprocess the face ROI
-            roi_gray = gray[y:y+h, x:x+w]
-            try:
-                # Resize to the model's expected input size
-                roi_gray = cv2.resize(roi_gray, (64, 64))
+        if tracker is not None:
+            with metrics.stage("emotion.track"):
+                tracks = tracker.update(gray)
+            with metrics.stage("emotion.format"):
+                detections = [self.format_detection(t.box, t.probs, t.id) for t in tracks if t.probs is not None]
+        else:
+            with metrics.stage("emotion.detect"):
+                faces = self.face_detector.detect(gray)
+            detections = self.classify_faces(gray, faces)
+        metrics.count("emotion.faces", len(detections))
+        if self.decode_scale != 1 and shape is None:
+            # Report boxes in the coordinates of the original full-size image
+            for detection in detections:
+                box = detection["box"]
+                for key in box:
+                    box[key] *= self.decode_scale
+        return detections
 
-                # Normalize and prepare for model prediction
-                roi = roi_gray.astype("float") / 255.0
-                roi = img_to_array(roi)
-                roi = np.expand_dims(roi, axis=0) # Add batch dimension
+    def classify_faces(self, gray, faces):
+        """Classify every face box in one forward pass and build the detection list."""
+        boxes, preds = self.predict_faces(gray, faces)
+        with metrics.stage("emotion.format"):
+            return [self.format_detection(box, probs) for box, probs in zip(boxes, preds)]
 
-                # Make prediction
-                preds = self.model.predict(roi, verbose=0)[0] # Get the first (and only) prediction result
-                emotion_idx = np.argmax(preds) # Use numpy argmax
-                emotion_probability = preds[emotion_idx]
-                label = f"{self.emotion_labels[emotion_idx]}: {emotion_probability:.2f}"
+    def predict_faces(self, gray, faces):
+        """Return (boxes, probabilities) for the face boxes that could be cropped."""
+        # Crop and resize every face first, then run a single (N, 64, 64, 1) predict
+        boxes = []
+        rois = np.empty((len(faces), 64, 64, 1), dtype=np.float32)
+        with metrics.stage("emotion.resize"):
+            for (x, y, w, h) in faces:
+                roi_gray = gray[y:y+h, x:x+w]
+                try:
+                    # Resize to the model's expected input size
+                    rois[len(boxes), :, :, 0] = cv2.resize(roi_gray, (64, 64))
+                except Exception as e:
+                    logging.error(f"Error processing face ROI at ({x},{y},{w},{h}): {str(e)}")
+                    continue
+                boxes.append((x, y, w, h))
 
-                detections.append({
-                    "box": {"x": int(x), "y": int(y), "width": int(w), "height": int(h)}, # Ensure integers
-                    "emotion": label
-                })
+        if not boxes:
+            return [], []
 
-            except Exception as e:
-                logging.error(f"Error processing face ROI at ({x},{y},{w},{h}): {str(e)}")
-                continue 
+        # Normalize the whole batch at once
+        rois = rois[:len(boxes)]
+        rois /= 255.0
 
-        return detections
+        try:
+            with metrics.stage("emotion.predict"):
+                if self.batcher is not None:
+                    preds = self.batcher.predict(rois)
+                else:
+                    preds = self.predict_batch(rois)
+        except Exception as e:
+            logging.error(f"Emotion prediction failed for {len(boxes)} faces: {str(e)}")
+            return [], []
 
+        return boxes, preds
 
-try:
-    emotion_analyzer = EmotionAnalyzer()
-    if not is_analyzer_ready():
-        logging.warning("EmotionAnalyzer might not be fully ready after instantiation. Check logs.")
-except Exception as e:
-    logging.critical(f"Failed to instantiate EmotionAnalyzer: {str(e)}")
-    emotion_analyzer = None 
+    def format_detection(self, box, probs, track_id=None):
+        x, y, w, h = box
+        emotion_idx = int(np.argmax(probs))
+        emotion_probability = probs[emotion_idx]
+        label = f"{self.emotion_labels[emotion_idx]}: {emotion_probability:.2f}"
+
+        detection = {
+            "box": {"x": int(x), "y": int(y), "width": int(w), "height": int(h)}, # Ensure integers
+            "emotion": label
+        }
+        if track_id is not None:
+            detection["id"] = track_id
+        return detection
+
+
+# The process-wide analyzer is created on first use, not at import, so tools that
+# only need the class (benchmarks, batch jobs) don't load the default model
+_emotion_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_emotion_analyzer(warm_up=False, **options):
+    """The shared EmotionAnalyzer, created on the first call (None if it failed).
+
+    ``options`` are EmotionAnalyzer keyword arguments (backend, detector,
+    batch_deadline_ms, ...); only the call that creates the analyzer uses them.
+    """
+    global _emotion_analyzer
+    with _analyzer_lock:
+        if _emotion_analyzer is None:
+            start = time.perf_counter()
+            try:
+                _emotion_analyzer = EmotionAnalyzer(**options)
+            except Exception as e:
+                logging.critical(f"Failed to instantiate EmotionAnalyzer: {str(e)}")
+                return None
+            logging.info(f"EmotionAnalyzer created in {time.perf_counter() - start:.2f}s.")
+            if not is_analyzer_ready():
+                logging.warning("EmotionAnalyzer might not be fully ready after instantiation. Check logs.")
+        elif options:
+            logging.warning("EmotionAnalyzer already exists; ignoring options passed to get_emotion_analyzer().")
+    if warm_up and is_analyzer_ready():
+        _emotion_analyzer.warm_up()
+    return _emotion_analyzer
 
 
 def is_analyzer_ready():
-    return emotion_analyzer is not None and emotion_analyzer.model is not None and emotion_analyzer.face_cascade is not None
+    """True once the shared analyzer exists with its model and detector loaded; never creates it."""
+    analyzer = _emotion_analyzer
+    return analyzer is not None and analyzer.model is not None and analyzer.face_detector is not None
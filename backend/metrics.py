@@ -0,0 +1,223 @@
+import bisect
+import contextlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+# Upper bounds in milliseconds; the last bucket is +Inf
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Disabled by default: stage() and frame() then hand back this shared no-op context,
+# so an instrumented hot path costs one function call. SIGNIFY_METRICS=1 or enable()
+# turns recording on; stdlib only so the desktop apps can use it too.
+_NULL = contextlib.nullcontext()
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_local = threading.local()
+_frames = itertools.count()
+
+_enabled = os.environ.get('SIGNIFY_METRICS', '') not in ('', '0')
+_trace_every = 0
+_trace_events = []
+_max_trace_events = 200000
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (count, sum, max) in milliseconds."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum += ms
+        if ms > self.max:
+            self.max = ms
+
+    def quantile(self, q):
+        """Estimate by linear interpolation inside the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = BUCKETS_MS[i - 1] if i else 0.0
+                upper = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max
+
+
+def enable(trace_every=0, max_trace_events=200000):
+    """Start recording; with trace_every=N every Nth frame() is traced."""
+    global _enabled, _trace_every, _max_trace_events
+    _trace_every = trace_every
+    _max_trace_events = max_trace_events
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _trace_events.clear()
+
+
+def record(name, start, ms):
+    """Add one timing (``start`` from time.perf_counter()) to the histogram and any active trace."""
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.observe(ms)
+    trace = getattr(_local, 'trace', None)
+    if trace is not None:
+        trace.append((name, start, ms))
+
+
+def count(name, n=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+class _Stage:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def stage(name):
+    """Time the enclosed block as ``name``; a no-op while metrics are disabled."""
+    if not _enabled:
+        return _NULL
+    return _Stage(name)
+
+
+@contextlib.contextmanager
+def _traced_frame(name, index):
+    _local.trace = trace = []
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        _local.trace = None
+        record(name, start, ms)
+        trace.append((name, start, ms))
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{"name": stage_name, "cat": "stage", "ph": "X", "ts": stage_start * 1e6,
+                   "dur": stage_ms * 1000, "pid": pid, "tid": tid, "args": {"frame": index}}
+                  for stage_name, stage_start, stage_ms in trace]
+        with _lock:
+            if len(_trace_events) + len(events) <= _max_trace_events:
+                _trace_events.extend(events)
+
+
+def frame(name):
+    """Mark one frame; every ``trace_every``-th frame records its stages as trace events."""
+    if not _enabled:
+        return _NULL
+    index = next(_frames)
+    if _trace_every and index % _trace_every == 0 and getattr(_local, 'trace', None) is None:
+        return _traced_frame(name, index)
+    return _Stage(name)
+
+
+def snapshot():
+    """{'histograms': {name: {count, sum_ms, max_ms, p50_ms, p95_ms, p99_ms}}, 'counters': {...}}"""
+    with _lock:
+        histograms = {
+            name: {"count": h.count, "sum_ms": h.sum, "max_ms": h.max,
+                   "p50_ms": h.quantile(0.5), "p95_ms": h.quantile(0.95), "p99_ms": h.quantile(0.99)}
+            for name, h in _histograms.items()
+        }
+        return {"histograms": histograms, "counters": dict(_counters)}
+
+
+def prometheus_text():
+    """Histograms and counters in the Prometheus text exposition format."""
+    lines = ["# TYPE signify_stage_duration_ms histogram"]
+    with _lock:
+        for name, h in sorted(_histograms.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS_MS, h.buckets):
+                cumulative += n
+                lines.append(f'signify_stage_duration_ms_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'signify_stage_duration_ms_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+            lines.append(f'signify_stage_duration_ms_sum{{stage="{name}"}} {h.sum:.3f}')
+            lines.append(f'signify_stage_duration_ms_count{{stage="{name}"}} {h.count}')
+        if _counters:
+            lines.append("# TYPE signify_events_total counter")
+        for name, n in sorted(_counters.items()):
+            lines.append(f'signify_events_total{{event="{name}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+def gauges_text(component, values):
+    """A component's stats() dict as Prometheus gauges, e.g. signify_batcher_queue_depth."""
+    lines = []
+    for name, value in sorted(values.items()):
+        metric = f"signify_{component}_{name}"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def format_summary():
+    stats = snapshot()
+    parts = [f"{name} n={s['count']} p50={s['p50_ms']:.2f} p95={s['p95_ms']:.2f} p99={s['p99_ms']:.2f} ms"
+             for name, s in sorted(stats["histograms"].items())]
+    parts += [f"{name}={n}" for name, n in sorted(stats["counters"].items())]
+    return " | ".join(parts)
+
+
+def start_log_dump(interval_s=60.0, log=logging.info):
+    """Pass a one-line summary to ``log`` every interval_s seconds from a daemon thread."""
+    def run():
+        while True:
+            time.sleep(interval_s)
+            summary = format_summary()
+            if summary:
+                log(f"metrics: {summary}")
+
+    thread = threading.Thread(target=run, name="metrics-log", daemon=True)
+    thread.start()
+    return thread
+
+
+def write_trace(path):
+    """Write the sampled frames as Chrome trace JSON; returns the number of events."""
+    with _lock:
+        events = list(_trace_events)
+    with open(path, 'w') as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from tflite_loader import load_interpreter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where resolve() looks for a model that isn't at the given path; the shared copies live in OpenCV/models
+MODEL_DIRS = [os.path.join(ROOT, 'OpenCV', 'models'), os.path.join(ROOT, 'backend', 'models'), os.path.join(ROOT, 'OpenCV')]
+
+# Converted artifacts (e.g. .hdf5 -> .tflite) are cached here under their source's content hash
+CACHE_DIR = os.environ.get('SIGNIFY_MODEL_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'signify', 'models'))
+
+_lock = threading.RLock()
+_handles = {}
+_hashes = {}
+
+
+class ModelHandle:
+    """One loaded model shared by every caller in the process.
+
+    ``lock`` serializes callers for runtimes that aren't thread-safe (TFLite);
+    ``shape`` is the interpreter's current input shape, so whoever resizes it
+    keeps it in sync for everyone else.
+    """
+
+    def __init__(self, kind, path, digest, model, load_s):
+        self.kind = kind
+        self.path = path
+        self.digest = digest
+        self.model = model
+        self.load_s = load_s
+        self.warm_up_s = None
+        self.lock = threading.Lock()
+        self.shape = None
+
+
+def resolve(path):
+    """``path`` if it exists, else the first model directory holding a file of that name."""
+    if os.path.exists(path):
+        return path
+    for model_dir in MODEL_DIRS:
+        candidate = os.path.join(model_dir, os.path.basename(path))
+        if os.path.exists(candidate):
+            return candidate
+    return path
+
+
+def content_hash(path):
+    """SHA-256 of the file, memoized on (path, size, mtime) so repeated lookups don't reread it."""
+    stat = os.stat(path)
+    key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _hashes.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        digest = _hashes[key] = sha.hexdigest()
+    return digest
+
+
+def load(kind, path, loader, warm_up=None, options=()):
+    """Shared handle for ``loader(path)``, loaded once per (kind, content, options) and warmed up.
+
+    Identical files at different paths share one load. ``warm_up(handle)`` runs
+    once, on the first call that passes it, so the first real call doesn't pay
+    for tracing or tensor allocation; a handle loaded cold is warmed up by the
+    first caller that asks for it.
+    """
+    path = resolve(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model file not found at {path}")
+    key = (kind, content_hash(path), tuple(options))
+    with _lock:
+        handle = _handles.get(key)
+        if handle is None:
+            start = time.perf_counter()
+            handle = ModelHandle(kind, path, key[1], loader(path), time.perf_counter() - start)
+            logging.info(f"Loaded {kind} model {os.path.basename(path)} ({key[1][:12]}) in {handle.load_s:.2f}s")
+            _handles[key] = handle
+        if warm_up is not None and handle.warm_up_s is None:
+            start = time.perf_counter()
+            warm_up(handle)
+            handle.warm_up_s = time.perf_counter() - start
+            logging.info(f"Warmed up {kind} model {os.path.basename(path)} in {handle.warm_up_s * 1000:.0f} ms")
+        return handle
+
+
+def _warm_keras(handle):
+    shape = [dim or 1 for dim in handle.model.input_shape]
+    handle.model.predict(np.zeros(shape, dtype=np.float32), verbose=0)
+
+
+def keras_model(path, warm_up=True):
+    """Shared Keras model (loaded without its training configuration)."""
+    def loader(model_path):
+        from tensorflow.keras.models import load_model
+        return load_model(model_path, compile=False)
+
+    return load('keras', path, loader, _warm_keras if warm_up else None)
+
+
+def converted_tflite(path):
+    """Path of the TFLite conversion of a Keras model, converting once per model content."""
+    path = resolve(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(CACHE_DIR, f"{stem}-{content_hash(path)[:16]}.tflite")
+    with _lock:
+        if not os.path.exists(cache_path):
+            logging.info(f"Converting {path} to TFLite...")
+            import tensorflow as tf
+
+            # Loaded outside the registry and dropped after converting, so a TFLite-only
+            # process doesn't keep the Keras model around
+            model = tf.keras.models.load_model(path, compile=False)
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(tf.lite.TFLiteConverter.from_keras_model(model).convert())
+            del model
+            # Atomic, so concurrent processes never load a half-written file
+            os.replace(tmp_path, cache_path)
+            logging.info(f"TFLite model cached at {cache_path}.")
+    return cache_path
+
+
+def _warm_tflite(handle):
+    interpreter = handle.model
+    with handle.lock:
+        detail = interpreter.get_input_details()[0]
+        interpreter.set_tensor(detail['index'], np.zeros(detail['shape'], dtype=detail['dtype']))
+        interpreter.invoke()
+
+
+def tflite_interpreter(path, batch=None, warm_up=True):
+    """Shared, allocated TFLite interpreter; Keras models (.h5/.hdf5) are converted first.
+
+    With ``batch`` the input is resized to that many rows once, and callers
+    asking for a different batch size get their own interpreter.
+    """
+    if os.path.splitext(path)[1] in ('.h5', '.hdf5'):
+        path = converted_tflite(path)
+
+    def loader(model_path):
+        interpreter = load_interpreter(model_path)
+        if batch is not None:
+            detail = interpreter.get_input_details()[0]
+            interpreter.resize_tensor_input(detail['index'], [batch, *detail['shape'][1:]])
+        interpreter.allocate_tensors()
+        return interpreter
+
+    handle = load('tflite', path, loader, _warm_tflite if warm_up else None, options=(batch,))
+    with handle.lock:
+        if handle.shape is None:
+            handle.shape = tuple(handle.model.get_input_details()[0]['shape'])
+    return handle
+
+
+def loaded():
+    """Summary of every model loaded in this process."""
+    with _lock:
+        return [{"kind": h.kind, "path": h.path, "sha256": h.digest, "load_s": h.load_s, "warm_up_s": h.warm_up_s}
+                for h in _handles.values()]
@@ -0,0 +1,218 @@
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+
+DISPATCH_POLICIES = ('least_loaded', 'round_robin')
+
+# How often the pool checks that its workers are still alive while waiting on results
+LIVENESS_INTERVAL_S = 1.0
+
+
+def _worker_main(index, slot_names, tasks, results, analyzer_options):
+    # Imported here so the model is loaded once per worker process, after spawn
+    import main
+
+    # Warmed up before reporting ready, so no worker's first real frame pays for it
+    analyzer = main.get_emotion_analyzer(warm_up=True, **analyzer_options)
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    results.put(('ready', index, None, main.is_analyzer_ready()))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, slot, length = task
+        view = slots[slot].buf[:length]
+        try:
+            results.put(('done', job_id, slot, analyzer.analyze_frame(view)))
+        except Exception as e:
+            results.put(('error', job_id, slot, str(e)))
+        finally:
+            view.release()
+
+    for shm in slots:
+        shm.close()
+
+
+class _Worker:
+    def __init__(self, ctx, index, slots_per_worker, max_frame_bytes, results, analyzer_options):
+        self.index = index
+        self.slots = [shared_memory.SharedMemory(create=True, size=max_frame_bytes)
+                      for _ in range(slots_per_worker)]
+        self.free_slots = list(range(slots_per_worker))
+        self.in_flight = 0
+        self.dead = False
+        self.tasks = ctx.Queue()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(index, [shm.name for shm in self.slots], self.tasks, results, analyzer_options),
+            name=f"emotion-worker-{index}",
+            daemon=True,
+        )
+
+
+class EmotionWorkerPool:
+    """Pre-started process pool where every worker holds its own EmotionAnalyzer.
+
+    Frame bytes are copied into a per-worker shared-memory slot and only
+    (job id, slot, length) crosses the process boundary, so images are never
+    pickled. A worker has ``slots_per_worker`` slots, which bounds how many
+    frames can be queued on it at once. ``analyzer_options`` are passed to
+    every worker's EmotionAnalyzer.
+    """
+
+    def __init__(self, workers=None, policy='least_loaded', slots_per_worker=2,
+                 max_frame_bytes=4 * 1024 * 1024, analyzer_options=None):
+        if policy not in DISPATCH_POLICIES:
+            raise ValueError(f"Unknown dispatch policy '{policy}', expected one of {DISPATCH_POLICIES}")
+        self.policy = policy
+        self.max_frame_bytes = max_frame_bytes
+
+        # spawn, not fork: TensorFlow state does not survive a fork
+        ctx = mp.get_context('spawn')
+        self._results = ctx.Queue()
+        self._workers = [_Worker(ctx, i, slots_per_worker, max_frame_bytes, self._results, analyzer_options or {})
+                         for i in range(workers or mp.cpu_count())]
+        self._jobs = {}
+        self._next_job = 0
+        self._next_worker = 0
+        self._slot_freed = threading.Condition()
+
+        for worker in self._workers:
+            worker.process.start()
+        self._wait_until_ready()
+
+        self._collector = threading.Thread(target=self._collect_results, name="emotion-pool-results", daemon=True)
+        self._collector.start()
+
+    def __len__(self):
+        return len(self._workers)
+
+    def _wait_until_ready(self):
+        """Wait for every worker's 'ready'; raises (after cleaning up) if one dies before sending it."""
+        pending = {worker.index for worker in self._workers}
+        while pending:
+            try:
+                _, index, _, ready = self._results.get(timeout=LIVENESS_INTERVAL_S)
+            except queue.Empty:
+                dead = [w.index for w in self._workers if w.index in pending and not w.process.is_alive()]
+                if dead:
+                    self._shutdown(force=True)
+                    raise RuntimeError(f"Emotion worker(s) {dead} exited during startup. Check logs.")
+                continue
+            pending.discard(index)
+            if not ready:
+                logging.warning(f"Worker {index} started but its EmotionAnalyzer is not ready. Check logs.")
+        logging.info(f"Emotion worker pool ready with {len(self._workers)} processes.")
+
+    def _reap_dead_workers(self):
+        """Fail the pending futures of workers that exited and take them out of dispatch."""
+        failed = []
+        with self._slot_freed:
+            for worker in self._workers:
+                if worker.dead or worker.process.is_alive():
+                    continue
+                worker.dead = True
+                worker.free_slots = []
+                logging.error(f"Emotion worker {worker.index} exited (code {worker.process.exitcode}).")
+                for job_id, (future, owner) in list(self._jobs.items()):
+                    if owner is worker:
+                        del self._jobs[job_id]
+                        failed.append(future)
+                worker.in_flight = 0
+            # Wake submit() so it can notice when no worker is left
+            self._slot_freed.notify_all()
+        for future in failed:
+            future.set_exception(RuntimeError("Emotion worker process died while analyzing the frame"))
+
+    def _pick_worker(self):
+        """Return a worker with a free slot according to the dispatch policy, or None."""
+        candidates = [w for w in self._workers if w.free_slots and not w.dead]
+        if not candidates:
+            return None
+        if self.policy == 'least_loaded':
+            return min(candidates, key=lambda w: w.in_flight)
+        for _ in range(len(self._workers)):
+            worker = self._workers[self._next_worker]
+            self._next_worker = (self._next_worker + 1) % len(self._workers)
+            if worker.free_slots and not worker.dead:
+                return worker
+        return None
+
+    def submit(self, image_bytes):
+        """Dispatch one encoded frame; returns a Future resolving to its detections."""
+        if len(image_bytes) > self.max_frame_bytes:
+            raise ValueError(f"Frame of {len(image_bytes)} bytes exceeds max_frame_bytes={self.max_frame_bytes}")
+
+        with self._slot_freed:
+            worker = self._pick_worker()
+            while worker is None:
+                if all(w.dead for w in self._workers):
+                    raise RuntimeError("All emotion worker processes have died")
+                self._slot_freed.wait()
+                worker = self._pick_worker()
+            slot = worker.free_slots.pop()
+            worker.in_flight += 1
+            job_id = self._next_job
+            self._next_job += 1
+            future = Future()
+            self._jobs[job_id] = (future, worker)
+
+        worker.slots[slot].buf[:len(image_bytes)] = image_bytes
+        worker.tasks.put((job_id, slot, len(image_bytes)))
+        return future
+
+    def analyze_frame(self, image_bytes):
+        """Blocking drop-in for EmotionAnalyzer.analyze_frame."""
+        return self.submit(image_bytes).result()
+
+    def _collect_results(self):
+        next_check = time.monotonic() + LIVENESS_INTERVAL_S
+        while True:
+            try:
+                message = self._results.get(timeout=LIVENESS_INTERVAL_S)
+            except queue.Empty:
+                message = False
+            if time.monotonic() >= next_check:
+                # Checked on a timer, not only when idle, so a busy pool still notices a crash
+                self._reap_dead_workers()
+                next_check = time.monotonic() + LIVENESS_INTERVAL_S
+            if message is False:
+                continue
+            if message is None:
+                break
+            kind, job_id, slot, payload = message
+            with self._slot_freed:
+                entry = self._jobs.pop(job_id, None)
+                if entry is None:
+                    # Its worker was already reaped and the future failed
+                    continue
+                future, worker = entry
+                worker.free_slots.append(slot)
+                worker.in_flight -= 1
+                self._slot_freed.notify()
+            if kind == 'done':
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def close(self):
+        self._shutdown()
+        self._results.put(None)
+        self._collector.join()
+
+    def _shutdown(self, force=False):
+        for worker in self._workers:
+            if force and worker.process.is_alive():
+                worker.process.terminate()
+            elif not force:
+                worker.tasks.put(None)
+        for worker in self._workers:
+            worker.process.join()
+            for shm in worker.slots:
+                shm.close()
+                shm.unlink()
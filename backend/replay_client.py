@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+from websockets.asyncio.client import connect
+
+
+def load_frames(image_dir, count, width, height):
+    """JPEG-encode every image in image_dir, or synthesize noise frames if none is given."""
+    frames = []
+    if image_dir:
+        paths = sorted(glob.glob(os.path.join(image_dir, '*')))
+        for path in paths:
+            image = cv2.imread(path)
+            if image is None:
+                continue
+            ok, buf = cv2.imencode('.jpg', image)
+            if ok:
+                frames.append(buf.tobytes())
+        if not frames:
+            raise SystemExit(f"[ERROR] No readable images in {image_dir}")
+    else:
+        rng = np.random.default_rng(0)
+        for _ in range(count):
+            image = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+            ok, buf = cv2.imencode('.jpg', image)
+            frames.append(buf.tobytes())
+    return frames
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+async def replay(url, frames, fps, total):
+    sent_at = {}
+    latencies = []
+    last_result = {}
+    errors = []
+
+    async with connect(url, max_size=8 * 1024 * 1024) as websocket:
+        async def receive():
+            async for message in websocket:
+                result = json.loads(message)
+                latencies.append((time.perf_counter() - sent_at.pop(result["frame"])) * 1000)
+                if "error" in result:
+                    errors.append(result["error"])
+                last_result.update(result)
+                if result["frame"] == total - 1:
+                    return
+
+        receiver = asyncio.create_task(receive())
+        interval = 1.0 / fps if fps > 0 else 0.0
+        start = time.perf_counter()
+        for seq in range(total):
+            sent_at[seq] = time.perf_counter()
+            await websocket.send(frames[seq % len(frames)])
+            # Pace against the wall clock so slow sends don't shift the schedule
+            delay = start + (seq + 1) * interval - time.perf_counter()
+            await asyncio.sleep(max(0.0, delay))
+
+        try:
+            await asyncio.wait_for(receiver, timeout=10)
+        except asyncio.TimeoutError:
+            receiver.cancel()
+        elapsed = time.perf_counter() - start
+
+    print(f"Sent {total} frames in {elapsed:.2f}s ({total / elapsed:.1f} fps offered)")
+    print(f"Answered: {len(latencies)}  failed: {len(errors)}  dropped by server: {last_result.get('dropped', 0)}")
+    if errors:
+        print(f"Last error: {errors[-1]}")
+    print(f"Round-trip ms  p50={percentile(latencies, 50):.1f}  "
+          f"p95={percentile(latencies, 95):.1f}  p99={percentile(latencies, 99):.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay images against the emotion stream server")
+    parser.add_argument('--url', default='ws://localhost:8765')
+    parser.add_argument('--images', help="Directory of images to replay (default: synthetic frames)")
+    parser.add_argument('--frames', type=int, default=300, help="Total frames to send")
+    parser.add_argument('--fps', type=float, default=30.0, help="Send rate; 0 sends as fast as possible")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    args = parser.parse_args()
+
+    frames = load_frames(args.images, min(args.frames, 30), args.width, args.height)
+    asyncio.run(replay(args.url, frames, args.fps, args.frames))
+
+
+if __name__ == "__main__":
+    main()
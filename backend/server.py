@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+import main
+import metrics
+from detectors import FACE_DETECTORS
+
+
+class LatestFrameSlot:
+    """Holds only the newest unprocessed frame for a connection.
+
+    When the client sends faster than we can analyze, older frames are
+    overwritten (and counted as dropped) instead of queueing up behind inference.
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.seq = -1
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def put(self, seq, frame):
+        if self.frame is not None:
+            self.dropped += 1
+        self.frame = frame
+        self.seq = seq
+        self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def take(self):
+        """Wait for a frame; returns (seq, None) once the connection closed with nothing pending."""
+        while self.frame is None and not self.closed:
+            self._ready.clear()
+            await self._ready.wait()
+        frame, seq = self.frame, self.seq
+        self.frame = None
+        return seq, frame
+
+
+# Largest frame message accepted; with a process pool, its shared-memory slot size instead
+MAX_MESSAGE_BYTES = 8 * 1024 * 1024
+
+
+class EmotionStreamServer:
+    def __init__(self, analyzer, workers=2, pool=None, track_every=0):
+        self.analyzer = analyzer
+        # Keyframe interval for per-connection face tracking; 0 detects on every frame
+        self.track_every = track_every
+        # With a process pool, threads only wait on pool futures
+        self.pool = pool
+        # Inference is CPU-bound; keep it off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="emotion-worker")
+
+    def health(self, connection, request):
+        if request.path == '/health':
+            status = HTTPStatus.OK if main.is_analyzer_ready() else HTTPStatus.SERVICE_UNAVAILABLE
+            return connection.respond(status, status.phrase + "\n")
+        if request.path == '/metrics':
+            batching = self.analyzer.batching_stats()
+            if not metrics.is_enabled() and batching is None:
+                return connection.respond(HTTPStatus.NOT_FOUND, "Metrics are disabled; start with --metrics\n")
+            text = metrics.prometheus_text() if metrics.is_enabled() else ""
+            if batching is not None:
+                # Micro-batcher queue depth and batch sizes of the in-process analyzer
+                text += metrics.gauges_text("batcher", batching)
+            return connection.respond(HTTPStatus.OK, text)
+        return None
+
+    async def handle(self, websocket):
+        slot = LatestFrameSlot()
+        logging.info(f"Client connected: {websocket.remote_address}")
+        reader = asyncio.create_task(self.receive_frames(websocket, slot))
+        try:
+            await self.process_frames(websocket, slot)
+        except ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+            logging.info(f"Client disconnected: {websocket.remote_address} ({slot.dropped} frames dropped)")
+
+    async def receive_frames(self, websocket, slot):
+        seq = 0
+        try:
+            async for message in websocket:
+                if isinstance(message, str):
+                    # Text messages are ignored; frames are sent as binary JPEG/PNG
+                    continue
+                slot.put(seq, message)
+                seq += 1
+        finally:
+            slot.close()
+
+    async def process_frames(self, websocket, slot):
+        loop = asyncio.get_running_loop()
+        tracker = self.analyzer.create_tracker(self.track_every) if self.track_every > 0 else None
+        analyze = functools.partial(self.analyzer.analyze_frame, tracker=tracker)
+        while True:
+            seq, frame = await slot.take()
+            if frame is None:
+                return
+
+            start = time.perf_counter()
+            try:
+                if self.pool is not None:
+                    # submit() blocks while every worker slot is busy; keep that wait off the event loop
+                    future = await loop.run_in_executor(self.executor, self.pool.submit, frame)
+                    detections = await asyncio.wrap_future(future)
+                else:
+                    detections = await loop.run_in_executor(self.executor, analyze, frame)
+            except Exception as e:
+                # A failed frame is reported to the client; the stream carries on with the next one
+                logging.error(f"Frame {seq} from {websocket.remote_address} failed: {str(e)}")
+                metrics.count("server.frame_errors")
+                await websocket.send(json.dumps({"frame": seq, "error": str(e), "dropped": slot.dropped}))
+                continue
+            latency_ms = (time.perf_counter() - start) * 1000
+            result = {
+                "frame": seq,
+                "detections": detections,
+                "dropped": slot.dropped,
+                "latency_ms": round(latency_ms, 2),
+            }
+            if metrics.is_enabled():
+                metrics.record("server.frame", start, latency_ms)
+            await websocket.send(json.dumps(result))
+
+    async def serve_forever(self, host, port):
+        # Frames the pool's slots can't hold are refused by the protocol layer instead of failing later
+        max_size = self.pool.max_frame_bytes if self.pool is not None else MAX_MESSAGE_BYTES
+        async with serve(self.handle, host, port, process_request=self.health, max_size=max_size):
+            logging.info(f"Emotion stream server listening on ws://{host}:{port}")
+            await asyncio.get_running_loop().create_future()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="WebSocket server streaming emotion detections per frame")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2, help="Inference worker threads")
+    parser.add_argument('--processes', type=int, default=0,
+                        help="Run inference in a pool of this many worker processes instead of threads")
+    parser.add_argument('--policy', default='least_loaded', choices=['least_loaded', 'round_robin'])
+    parser.add_argument('--backend', default='keras', choices=main.INFERENCE_BACKENDS,
+                        help="Emotion model runtime; tflite is usually fastest on CPU")
+    parser.add_argument('--decode-scale', type=int, default=1, choices=sorted(main.REDUCED_GRAYSCALE_FLAGS),
+                        help="Decode JPEGs at 1/N size (boxes are still reported at full size)")
+    parser.add_argument('--detector', default='haar', choices=sorted(FACE_DETECTORS),
+                        help="Face detector; dnn is more robust to pose and lighting")
+    parser.add_argument('--detect-width', type=int, default=None,
+                        help="Run face detection on a copy downscaled to this width")
+    parser.add_argument('--batch-deadline-ms', type=float, default=None,
+                        help="Micro-batch concurrent frames into one forward pass, waiting at most this long "
+                             "(off by default; pays off with several --workers threads)")
+    parser.add_argument('--max-batch-size', type=int, default=64, help="Face rows per micro-batch")
+    parser.add_argument('--track-every', type=int, default=0,
+                        help="Run full detection every K frames and track faces in between (0 = off)")
+    parser.add_argument('--metrics', action='store_true',
+                        help="Record per-stage histograms and serve them at /metrics (Prometheus text)")
+    parser.add_argument('--metrics-log-interval', type=float, default=0,
+                        help="Also log a metrics summary every N seconds (0 = off)")
+    parser.add_argument('--trace-every', type=int, default=0,
+                        help="Record every Nth frame as Chrome trace events (needs --metrics)")
+    parser.add_argument('--trace-path', default='emotion_trace.json', help="Where the trace is written on shutdown")
+    args = parser.parse_args()
+
+    if args.track_every and args.processes:
+        parser.error("--track-every keeps per-connection state and can't be combined with --processes")
+
+    analyzer_options = {
+        'backend': args.backend,
+        'decode_scale': args.decode_scale,
+        'detector': args.detector,
+        'detector_options': {'detect_width': args.detect_width},
+        'batch_deadline_ms': args.batch_deadline_ms,
+        'max_batch_size': args.max_batch_size,
+    }
+    start = time.perf_counter()
+    analyzer = main.get_emotion_analyzer(warm_up=True, **analyzer_options)
+    if not main.is_analyzer_ready():
+        logging.critical("EmotionAnalyzer is not ready; refusing to start the server.")
+        return
+
+    if args.metrics:
+        # Stage histograms cover inference in this process; with --processes only server.frame is recorded
+        metrics.enable(trace_every=args.trace_every)
+        if args.metrics_log_interval > 0:
+            metrics.start_log_dump(args.metrics_log_interval)
+
+    pool = None
+    if args.processes > 0:
+        from pool import EmotionWorkerPool
+        pool = EmotionWorkerPool(workers=args.processes, policy=args.policy, analyzer_options=analyzer_options)
+    logging.info(f"Startup took {time.perf_counter() - start:.2f}s.")
+
+    server = EmotionStreamServer(analyzer, workers=args.workers, pool=pool,
+                                 track_every=args.track_every)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        logging.info("Shutting down.")
+    finally:
+        if pool is not None:
+            pool.close()
+        if args.metrics and args.trace_every:
+            events = metrics.write_trace(args.trace_path)
+            logging.info(f"Wrote {events} trace events to {args.trace_path}")
+
+
+if __name__ == "__main__":
+    main_cli()
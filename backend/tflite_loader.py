@@ -0,0 +1,29 @@
+import functools
+import logging
+
+
+@functools.lru_cache(maxsize=None)
+def interpreter_class():
+    """The lightest available TFLite Interpreter: LiteRT, then tflite-runtime, then full TensorFlow.
+
+    The standalone runtimes import in a fraction of the time and memory of
+    TensorFlow, so processes that only run .tflite models should install one
+    of them (pip install ai-edge-litert / tflite-runtime).
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    logging.info("No standalone TFLite runtime installed; falling back to tensorflow.lite")
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+def load_interpreter(model_path, num_threads=None):
+    return interpreter_class()(model_path=model_path, num_threads=num_threads)
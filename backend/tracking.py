@@ -0,0 +1,130 @@
+import itertools
+
+import cv2
+import numpy as np
+
+from detectors import iou
+
+
+class FaceTrack:
+    def __init__(self, track_id, box):
+        self.id = track_id
+        self.box = box
+        self.probs = None
+        self.points = None
+        self.missed = 0
+
+
+class FaceTracker:
+    """Runs full detection every ``keyframe_interval`` frames and follows faces in between.
+
+    On keyframes, detections are matched to existing tracks by IoU; matched and
+    new tracks are re-classified in one batch and their emotion probabilities are
+    smoothed with an exponential moving average. Between keyframes, each box is
+    shifted by the median Lucas-Kanade optical flow of corner points inside it and
+    the last prediction is reused, so neither the detector nor the model runs.
+
+    ``detect_fn(gray)`` returns (x, y, w, h) boxes; ``classify_fn(gray, boxes)``
+    returns an (N, num_classes) probability array in the same order.
+    """
+
+    def __init__(self, detect_fn, classify_fn, keyframe_interval=5, iou_threshold=0.3,
+                 smoothing=0.6, max_missed=2):
+        self.detect_fn = detect_fn
+        self.classify_fn = classify_fn
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.iou_threshold = iou_threshold
+        self.smoothing = smoothing
+        self.max_missed = max_missed
+
+        self.tracks = []
+        self.frame_index = 0
+        self.prev_gray = None
+        self._ids = itertools.count()
+
+    def update(self, gray):
+        """Advance one frame and return the live tracks."""
+        if self.frame_index % self.keyframe_interval == 0 or not self.tracks or self.prev_gray is None \
+                or self.prev_gray.shape != gray.shape:
+            self._keyframe(gray)
+        else:
+            self._propagate(gray)
+
+        self.frame_index += 1
+        self.prev_gray = gray
+        return self.tracks
+
+    def _keyframe(self, gray):
+        boxes = [tuple(int(v) for v in box) for box in self.detect_fn(gray)]
+
+        # Greedy IoU matching, best overlaps first
+        pairs = sorted(((iou(t.box, b), ti, bi) for ti, t in enumerate(self.tracks) for bi, b in enumerate(boxes)),
+                       reverse=True)
+        matched_tracks, matched_boxes = {}, set()
+        for overlap, ti, bi in pairs:
+            if overlap < self.iou_threshold:
+                break
+            if ti in matched_tracks or bi in matched_boxes:
+                continue
+            matched_tracks[ti] = bi
+            matched_boxes.add(bi)
+
+        live = []
+        for ti, track in enumerate(self.tracks):
+            if ti in matched_tracks:
+                track.box = boxes[matched_tracks[ti]]
+                track.missed = 0
+                live.append(track)
+            else:
+                track.missed += 1
+                if track.missed <= self.max_missed:
+                    live.append(track)
+        for bi, box in enumerate(boxes):
+            if bi not in matched_boxes:
+                live.append(FaceTrack(next(self._ids), box))
+        self.tracks = live
+
+        # Only tracks seen on this keyframe are (re)classified, all in one batch
+        seen = [t for t in self.tracks if t.missed == 0]
+        if seen:
+            probs = self.classify_fn(gray, [t.box for t in seen])
+            for track, p in zip(seen, probs):
+                p = np.asarray(p, dtype=np.float32)
+                track.probs = p if track.probs is None else self.smoothing * p + (1 - self.smoothing) * track.probs
+        for track in seen:
+            track.points = self._seed_points(gray, track.box)
+
+    def _seed_points(self, gray, box):
+        x, y, w, h = box
+        corners = cv2.goodFeaturesToTrack(gray[y:y+h, x:x+w], maxCorners=20, qualityLevel=0.01, minDistance=5)
+        if corners is None:
+            return None
+        return corners.astype(np.float32) + np.array([x, y], dtype=np.float32)
+
+    def _propagate(self, gray):
+        tracked = [t for t in self.tracks if t.points is not None and len(t.points)]
+        if not tracked:
+            return
+
+        # One LK call for every point of every track
+        points = np.concatenate([t.points for t in tracked])
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, points, None,
+                                                    winSize=(15, 15), maxLevel=2)
+        status = status.ravel().astype(bool)
+
+        height, width = gray.shape[:2]
+        offset = 0
+        for track in tracked:
+            n = len(track.points)
+            ok = status[offset:offset + n]
+            old, new = track.points[ok], moved[offset:offset + n][ok]
+            offset += n
+            if len(new) < 3:
+                track.points = None
+                continue
+            dx, dy = np.median((new - old).reshape(-1, 2), axis=0)
+            x, y, w, h = track.box
+            x = int(np.clip(round(x + dx), 0, max(0, width - w)))
+            y = int(np.clip(round(y + dy), 0, max(0, height - h)))
+            track.box = (x, y, w, h)
+            track.points = new
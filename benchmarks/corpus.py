@@ -0,0 +1,129 @@
+# corpus.py
+#
+# Deterministic benchmark corpus: JPEG frames with a drawn face, plausible hand
+# landmark arrays and fingertip trajectories. Generated from a fixed seed on
+# first use and reused while the manifest matches, so every run (and every
+# machine) replays exactly the same inputs.
+
+import glob
+import json
+import os
+
+import cv2
+import numpy as np
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+MANIFEST = 'manifest.json'
+CORPUS_VERSION = 1
+
+
+def _draw_face(image, rng):
+    """A face-like blob (head, eyes, mouth) at a random position and size."""
+    h, w = image.shape[:2]
+    size = int(rng.integers(h // 5, h // 2))
+    cx = int(rng.integers(size, w - size))
+    cy = int(rng.integers(size, h - size))
+    skin = tuple(int(v) for v in rng.integers(120, 220, 3))
+    cv2.ellipse(image, (cx, cy), (int(size * 0.75), size), 0, 0, 360, skin, -1)
+    for dx in (-0.3, 0.3):
+        cv2.circle(image, (cx + int(dx * size), cy - int(0.2 * size)), max(2, size // 10), (30, 30, 30), -1)
+    cv2.ellipse(image, (cx, cy + int(0.4 * size)), (size // 3, size // 8), 0, 0, 180, (40, 40, 120), 3)
+
+
+def make_frames(count, width, height, rng):
+    frames = []
+    gradient = np.linspace(40, 200, width, dtype=np.float32)[np.newaxis, :, np.newaxis]
+    for _ in range(count):
+        noise = rng.normal(0, 12, size=(height, width, 3)).astype(np.float32)
+        image = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+        _draw_face(image, rng)
+        frames.append(image)
+    return frames
+
+
+def hand_template():
+    """Rough open-hand pose in normalized image coordinates: wrist plus 4 joints per finger."""
+    points = [(0.0, 0.0)]
+    for angle, length in zip(np.radians([-50, -20, 0, 20, 40]), (0.10, 0.14, 0.15, 0.14, 0.11)):
+        for joint in range(1, 5):
+            r = length * joint / 2
+            points.append((np.sin(angle) * r, -np.cos(angle) * r))
+    return np.array(points, dtype=np.float32)
+
+
+def make_landmarks(count, rng):
+    """(count, 63) x, y, z landmarks: the template rotated, scaled, moved and jittered."""
+    template = hand_template()
+    out = np.empty((count, 21, 3), dtype=np.float32)
+    for i in range(count):
+        theta = rng.uniform(-0.5, 0.5)
+        rot = np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]], dtype=np.float32)
+        xy = template @ rot.T * rng.uniform(0.7, 1.3) + rng.uniform(0.3, 0.7, 2)
+        out[i, :, :2] = xy + rng.normal(0, 0.01, xy.shape)
+        out[i, :, 2] = rng.normal(0, 0.02, 21)
+    return out.reshape(count, 63)
+
+
+def make_trajectories(count, length, rng):
+    """(count, length, 2) fingertip paths: J-like hooks and Z-like zigzags."""
+    t = np.linspace(0, 1, length, dtype=np.float32)
+    out = np.empty((count, length, 2), dtype=np.float32)
+    for i in range(count):
+        if i % 2 == 0:
+            path = np.stack([0.5 + 0.1 * np.sin(np.pi * t) * (t > 0.6), 0.3 + 0.4 * t], axis=1)
+        else:
+            path = np.stack([0.4 + 0.2 * np.abs(((3 * t) % 2) - 1), 0.3 + 0.3 * t], axis=1)
+        out[i] = path + rng.normal(0, 0.005, path.shape)
+    return out
+
+
+def _manifest(frames, width, height, landmarks, trajectories, seed):
+    return {'version': CORPUS_VERSION, 'frames': frames, 'width': width, 'height': height,
+            'landmarks': landmarks, 'trajectories': trajectories, 'seed': seed}
+
+
+def ensure_corpus(corpus_dir=CORPUS_DIR, frames=60, width=640, height=480, landmarks=512, trajectories=64,
+                  seed=0):
+    """Generate the corpus unless an identical one is already on disk; returns its manifest."""
+    manifest = _manifest(frames, width, height, landmarks, trajectories, seed)
+    manifest_path = os.path.join(corpus_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f) == manifest:
+                return manifest
+
+    print(f"[INFO] Generating benchmark corpus in {corpus_dir}...")
+    rng = np.random.default_rng(seed)
+    frame_dir = os.path.join(corpus_dir, 'frames')
+    os.makedirs(frame_dir, exist_ok=True)
+    for old in glob.glob(os.path.join(frame_dir, '*.jpg')):
+        os.remove(old)
+    for i, image in enumerate(make_frames(frames, width, height, rng)):
+        cv2.imwrite(os.path.join(frame_dir, f'{i:04d}.jpg'), image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    np.save(os.path.join(corpus_dir, 'landmarks.npy'), make_landmarks(landmarks, rng))
+    np.save(os.path.join(corpus_dir, 'trajectories.npy'), make_trajectories(trajectories, 15, rng))
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_jpegs(corpus_dir=CORPUS_DIR):
+    """Raw JPEG bytes of every corpus frame, in order."""
+    frames = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, 'frames', '*.jpg'))):
+        with open(path, 'rb') as f:
+            frames.append(f.read())
+    return frames
+
+
+def load_images(corpus_dir=CORPUS_DIR):
+    """Decoded BGR corpus frames."""
+    return [cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) for data in load_jpegs(corpus_dir)]
+
+
+def load_landmarks(corpus_dir=CORPUS_DIR):
+    return np.load(os.path.join(corpus_dir, 'landmarks.npy'))
+
+
+def load_trajectories(corpus_dir=CORPUS_DIR):
+    return np.load(os.path.join(corpus_dir, 'trajectories.npy'))
@@ -0,0 +1,283 @@
+# run.py
+#
+# Headless benchmark suite for every inference path. Each stage replays the
+# fixed corpus from corpus.py in its own spawned process (so imports, model
+# memory and peak RSS don't bleed between stages) and reports p50/p95/p99
+# latency, throughput and peak RSS. Results are written as JSON and can be
+# compared against a stored baseline; a regression makes the run exit non-zero.
+#
+#   python benchmarks/run.py                        # run, print, write results.json
+#   python benchmarks/run.py --save-baseline        # record benchmarks/baseline.json
+#   python benchmarks/run.py --stages asl_dense.classify,mediapipe.hands
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, 'benchmarks')
+OPENCV_DIR = os.path.join(ROOT, 'OpenCV')
+BACKEND_DIR = os.path.join(ROOT, 'backend')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Metric -> direction in which a change is a regression
+COMPARED_METRICS = {'p50_ms': 1, 'p95_ms': 1, 'p99_ms': 1, 'throughput_per_s': -1, 'peak_rss_mib': 1}
+
+
+class StageUnavailable(Exception):
+    """A stage's dependency or model file is missing on this machine."""
+
+
+def _require_file(path):
+    if not os.path.exists(path):
+        raise StageUnavailable(f"{os.path.relpath(path, ROOT)} not found")
+    return path
+
+
+def setup_emotion(options):
+    """EmotionAnalyzer.analyze_frame on JPEG bytes (decode, detect, classify)."""
+    sys.path.insert(0, BACKEND_DIR)
+    import corpus
+    from main import EmotionAnalyzer
+
+    analyzer = EmotionAnalyzer(model_path=_require_file(options['emotion_model']), backend=options['emotion_backend'])
+    if analyzer.model is None or analyzer.face_detector is None:
+        raise StageUnavailable("EmotionAnalyzer failed to load")
+    return analyzer.analyze_frame, corpus.load_jpegs()
+
+
+def setup_asl_dense(options):
+    """StaticClassifier.classify on one landmark vector, as in predict_static."""
+    sys.path.insert(0, OPENCV_DIR)
+    import corpus
+    from landmarks import StaticClassifier
+
+    classifier = StaticClassifier(_require_file(options['asl_model']))
+    out = np.empty(26, dtype=np.float32)
+    return lambda landmarks: classifier.classify(landmarks, out=out), list(corpus.load_landmarks())
+
+
+def setup_hands(options):
+    """MediaPipe hands.process on RGB frames, tracking mode as in the live apps."""
+    import cv2
+    import corpus
+    import mediapipe
+
+    hands = mediapipe.solutions.hands.Hands(static_image_mode=False, max_num_hands=options['max_hands'],
+                                            min_detection_confidence=0.5)
+    images = [cv2.cvtColor(image, cv2.COLOR_BGR2RGB) for image in corpus.load_images()]
+    return hands.process, images
+
+
+def setup_yolo(options):
+    """YOLO predict on BGR frames, as in sign_language.py capture_sign."""
+    import corpus
+    from ultralytics import YOLO
+
+    model = YOLO(_require_file(options['yolo_model']))
+    return (lambda frame: model.predict(source=frame, save=False, conf=0.6, imgsz=options['imgsz'],
+                                        device='cpu', verbose=False)), corpus.load_images()
+
+
+def setup_motion(options):
+    """MotionClassifier.update over fingertip trajectories, invoking on every full window."""
+    sys.path.insert(0, OPENCV_DIR)
+    import corpus
+    from motion import MotionClassifier
+
+    classifier = MotionClassifier(_require_file(options['motion_model']), energy_threshold=0.0, min_confidence=2.0)
+    points = corpus.load_trajectories().reshape(-1, 2)
+    return (lambda point: classifier.update(point[0], point[1])), list(points)
+
+
+STAGES = {
+    'emotion.analyze_frame': setup_emotion,
+    'asl_dense.classify': setup_asl_dense,
+    'mediapipe.hands': setup_hands,
+    'yolo.capture_sign': setup_yolo,
+    'motion.classify': setup_motion,
+}
+
+
+def _peak_rss_mib():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_stage(name, options, iterations, warmup, threads, results):
+    """Child process: set up one stage, replay the corpus and report its numbers."""
+    os.environ['CUDA_VISIBLE_DEVICES'] = ''
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    if threads:
+        for var in ('OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS', 'MKL_NUM_THREADS'):
+            os.environ[var] = str(threads)
+    sys.path.insert(0, BENCH_DIR)
+    try:
+        start = time.perf_counter()
+        fn, items = STAGES[name](options)
+        setup_s = time.perf_counter() - start
+        rss_after_setup = _peak_rss_mib()
+
+        for i in range(warmup):
+            fn(items[i % len(items)])
+        latencies = np.empty(iterations, dtype=np.float64)
+        wall_start = time.perf_counter()
+        for i in range(iterations):
+            start = time.perf_counter()
+            fn(items[i % len(items)])
+            latencies[i] = (time.perf_counter() - start) * 1000
+        wall = time.perf_counter() - wall_start
+    except (StageUnavailable, ImportError) as e:
+        results.put((name, {'skipped': str(e)}))
+        return
+
+    results.put((name, {
+        'iterations': iterations,
+        'setup_s': round(setup_s, 3),
+        'mean_ms': float(latencies.mean()),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+        'throughput_per_s': iterations / wall,
+        'setup_rss_mib': rss_after_setup,
+        'peak_rss_mib': _peak_rss_mib(),
+    }))
+
+
+def run_stages(names, options, iterations, warmup, threads):
+    ctx = mp.get_context('spawn')
+    results = ctx.Queue()
+    stages = {}
+    for name in names:
+        proc = ctx.Process(target=_run_stage, args=(name, options, iterations, warmup, threads, results))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            stages[name] = {'failed': f"exit code {proc.exitcode}"}
+            continue
+        _, stages[name] = results.get()
+    return stages
+
+
+def environment(options, corpus_manifest, threads):
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'threads': threads,
+        'options': options,
+        'corpus': corpus_manifest,
+    }
+
+
+def compare(stages, baseline, tolerance):
+    """Per-stage relative changes against the baseline; returns (rows, regressions)."""
+    rows, regressions = [], []
+    for name, result in stages.items():
+        base = baseline.get('stages', {}).get(name)
+        if not base or 'p50_ms' not in base or 'p50_ms' not in result:
+            continue
+        for metric, direction in COMPARED_METRICS.items():
+            if not base[metric]:
+                continue
+            change = (result[metric] - base[metric]) / base[metric]
+            regressed = change * direction > tolerance
+            rows.append((name, metric, base[metric], result[metric], change, regressed))
+            if regressed:
+                regressions.append(f"{name} {metric}")
+    return rows, regressions
+
+
+def print_results(stages):
+    print(f"\n{'stage':<24} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'per s':>9} {'setup s':>8} {'RSS MiB':>8}")
+    for name, r in stages.items():
+        if 'p50_ms' not in r:
+            print(f"{name:<24} {r.get('skipped') or r.get('failed')}")
+            continue
+        print(f"{name:<24} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} "
+              f"{r['throughput_per_s']:>9.1f} {r['setup_s']:>8.2f} {r['peak_rss_mib']:>8.0f}")
+
+
+def print_comparison(rows, tolerance):
+    print(f"\nAgainst baseline (tolerance {tolerance:.0%}):")
+    for name, metric, base, current, change, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f"  {name:<24} {metric:<17} {base:>10.3f} -> {current:>10.3f} {change:>+8.1%} {flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless latency/throughput/RSS benchmarks for every inference path")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=0, help="Cap math-library threads per stage (0 = default)")
+    parser.add_argument('--frames', type=int, default=60, help="Synthetic corpus frames")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--emotion-model', default=os.path.join(OPENCV_DIR, 'models', 'fer2013_mini_XCEPTION.102-0.66.hdf5'))
+    parser.add_argument('--emotion-backend', default='keras', choices=['keras', 'function', 'tflite'])
+    parser.add_argument('--asl-model', default=os.path.join(OPENCV_DIR, 'asl_dense.tflite'))
+    parser.add_argument('--motion-model', default=os.path.join(OPENCV_DIR, 'motion_model_jz.h5'))
+    parser.add_argument('--yolo-model', default=os.path.join(OPENCV_DIR, 'models', 'best.pt'))
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--max-hands', type=int, default=1)
+    parser.add_argument('-o', '--output', default='results.json')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Write these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="Relative change that counts as a regression")
+    args = parser.parse_args()
+
+    names = [name for name in args.stages.split(',') if name]
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(unknown)}")
+
+    sys.path.insert(0, BENCH_DIR)
+    from corpus import ensure_corpus
+    manifest = ensure_corpus(frames=args.frames, width=args.width, height=args.height)
+
+    options = {
+        'emotion_model': args.emotion_model, 'emotion_backend': args.emotion_backend,
+        'asl_model': args.asl_model, 'motion_model': args.motion_model, 'yolo_model': args.yolo_model,
+        'imgsz': args.imgsz, 'max_hands': args.max_hands,
+    }
+    stages = run_stages(names, options, args.iterations, args.warmup, args.threads)
+    report = {'environment': environment(options, manifest, args.threads), 'stages': stages}
+    print_results(stages)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['environment']['corpus'] != manifest:
+            print("\n[WARN] Baseline was recorded on a different corpus; comparison skipped")
+        else:
+            rows, regressions = compare(stages, baseline, args.tolerance)
+            print_comparison(rows, args.tolerance)
+            report['regressions'] = regressions
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[INFO] Results written to {args.output}")
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Baseline written to {args.baseline}")
+
+    if regressions:
+        print(f"[ERROR] {len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# startup.py
+#
+# Cold-start time per entry point. Every entry point is imported (and, where
+# it has one, brought to a ready state: model loaded and warmed up) in a fresh
+# interpreter, repeatedly, and the median import/ready/process times are
+# reported together with which heavy frameworks ended up imported.
+#
+#   python benchmarks/startup.py
+#   python benchmarks/startup.py --entries backend.main,asl_dense --repeats 5
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPENCV_DIR = os.path.join(ROOT, 'OpenCV')
+BACKEND_DIR = os.path.join(ROOT, 'backend')
+FER_MODEL = os.path.join(OPENCV_DIR, 'models', 'fer2013_mini_XCEPTION.102-0.66.hdf5')
+
+HEAVY_MODULES = ('tensorflow', 'keras', 'tflite_runtime', 'ai_edge_litert', 'mediapipe', 'torch', 'ultralytics',
+                 'PIL', 'pyttsx3', 'PyQt5')
+
+# name -> (working directory, import statement, statement that makes it ready or None)
+ENTRY_POINTS = {
+    'backend.main': (BACKEND_DIR, "import main", None),
+    'backend.analyzer': (BACKEND_DIR, "import main",
+                         "main.EmotionAnalyzer(model_path={model!r}, backend={backend!r}).warm_up()"),
+    'backend.server': (BACKEND_DIR, "import server", None),
+    'asl_dense': (OPENCV_DIR, "from landmarks import StaticClassifier",
+                  "StaticClassifier('asl_dense.tflite').classify([0.0] * 63)"),
+    'motion': (OPENCV_DIR, "from motion import MotionClassifier", "MotionClassifier('motion_model_jz.h5')"),
+    'SignTranslatorPlain': (OPENCV_DIR, "import SignTranslatorPlain as app", "app.load_models()"),
+    'emotion_recognition': (OPENCV_DIR, "import emotion_recognition as app", "app.initialize_model()"),
+    'FER.emotion_recognition': (os.path.join(OPENCV_DIR, 'FER'), "import emotion_recognition as app",
+                                "app.initialize_model()"),
+    'sign_language': (OPENCV_DIR, "import sign_language", None),
+    'batch_translate': (OPENCV_DIR, "import batch_translate", None),
+}
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+{ready}
+ready = time.perf_counter()
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print("STARTUP " + json.dumps({{"import_s": imported - start, "ready_s": ready - start, "heavy": heavy}}))
+"""
+
+
+def measure(name, options):
+    cwd, imports, ready = ENTRY_POINTS[name]
+    code = SNIPPET.format(imports=imports, ready=(ready or "pass").format(**options), heavy=HEAVY_MODULES)
+    env = dict(os.environ, CUDA_VISIBLE_DEVICES='', TF_CPP_MIN_LOG_LEVEL='2')
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, capture_output=True, text=True)
+    total = time.perf_counter() - start
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("STARTUP ")]
+    if proc.returncode != 0 or not lines:
+        error = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        return {'failed': error}
+    result = json.loads(lines[-1][len("STARTUP "):])
+    result['process_s'] = total
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import and ready time for every entry point")
+    parser.add_argument('--entries', default=','.join(ENTRY_POINTS),
+                        help=f"Comma-separated subset of: {', '.join(ENTRY_POINTS)}")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--emotion-model', default=FER_MODEL)
+    parser.add_argument('--emotion-backend', default='tflite', choices=['keras', 'function', 'tflite'])
+    parser.add_argument('-o', '--output', default='startup.json')
+    args = parser.parse_args()
+    options = {'model': args.emotion_model, 'backend': args.emotion_backend}
+
+    names = [name for name in args.entries.split(',') if name]
+    unknown = [name for name in names if name not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"Unknown entries: {', '.join(unknown)}")
+
+    report = {}
+    print(f"{'entry point':<22} {'import s':>9} {'ready s':>9} {'process s':>10}  heavy imports")
+    for name in names:
+        runs = [measure(name, options) for _ in range(args.repeats)]
+        failed = [run for run in runs if 'failed' in run]
+        if failed:
+            report[name] = failed[0]
+            print(f"{name:<22} failed: {failed[0]['failed']}")
+            continue
+        report[name] = {key: float(np.median([run[key] for run in runs]))
+                        for key in ('import_s', 'ready_s', 'process_s')}
+        report[name]['heavy'] = runs[0]['heavy']
+        r = report[name]
+        print(f"{name:<22} {r['import_s']:>9.2f} {r['ready_s']:>9.2f} {r['process_s']:>10.2f}  "
+              f"{', '.join(r['heavy']) or '-'}")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[INFO] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
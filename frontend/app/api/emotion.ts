@@ -0,0 +1,61 @@
+export type EmotionDetection = {
+  box: { x: number; y: number; width: number; height: number };
+  emotion: string;
+  // Stable per-face track id, present when the server runs with --track-every
+  id?: number;
+};
+
+export type EmotionResult =
+  | { frame: number; detections: EmotionDetection[]; dropped: number; latency_ms: number }
+  // The server couldn't analyze this frame; the stream carries on with the next one
+  | { frame: number; error: string; dropped: number };
+
+const DEFAULT_URL = process.env.NEXT_PUBLIC_EMOTION_WS_URL ?? 'ws://localhost:8765';
+
+// Streams JPEG frames from a <video> element to the backend emotion server.
+// Only one frame is in flight at a time, so a slow server never builds a backlog.
+export function streamEmotions(
+  video: HTMLVideoElement,
+  onResult: (result: EmotionResult) => void,
+  url: string = DEFAULT_URL,
+  quality = 0.7,
+): () => void {
+  const socket = new WebSocket(url);
+  socket.binaryType = 'arraybuffer';
+  const canvas = document.createElement('canvas');
+  let inFlight = false;
+  let stopped = false;
+
+  const sendFrame = () => {
+    if (stopped || inFlight || socket.readyState !== WebSocket.OPEN || !video.videoWidth) return;
+    canvas.width = video.videoWidth;
+    canvas.height = video.videoHeight;
+    canvas.getContext('2d')?.drawImage(video, 0, 0);
+    // Claimed before the async encode, so the next tick can't start a second frame
+    inFlight = true;
+    canvas.toBlob(
+      async (blob) => {
+        if (!blob || stopped) {
+          inFlight = false;
+          return;
+        }
+        socket.send(await blob.arrayBuffer());
+      },
+      'image/jpeg',
+      quality,
+    );
+  };
+
+  socket.onmessage = (event) => {
+    inFlight = false;
+    onResult(JSON.parse(event.data as string) as EmotionResult);
+  };
+
+  const timer = window.setInterval(sendFrame, 33);
+
+  return () => {
+    stopped = true;
+    window.clearInterval(timer);
+    socket.close();
+  };
+}
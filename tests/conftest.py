@@ -0,0 +1,9 @@
+# The apps import their modules flat from OpenCV/ and backend/; the tests do the same.
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ('OpenCV', 'backend'):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
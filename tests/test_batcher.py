@@ -0,0 +1,60 @@
+import threading
+
+import numpy as np
+import pytest
+
+from batcher import MicroBatcher
+
+
+class RecordingModel:
+    """Doubles its input and remembers every batch size it was called with."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, batch):
+        with self.lock:
+            self.batch_sizes.append(len(batch))
+        return batch * 2
+
+
+def test_each_caller_gets_its_own_rows():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=64, max_delay_ms=50)
+    inputs = [np.full((n, 3), i, dtype=np.float32) for i, n in enumerate([1, 3, 2, 4])]
+    futures = [batcher.submit(x) for x in inputs]
+    for x, future in zip(inputs, futures):
+        np.testing.assert_array_equal(future.result(timeout=5), x * 2)
+    batcher.close()
+    assert sum(model.batch_sizes) == 10
+    assert batcher.stats()['requests'] == 4
+
+
+def test_batches_never_exceed_the_cap():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=5, max_delay_ms=50)
+    futures = [batcher.submit(np.full((2, 1), i, dtype=np.float32)) for i in range(6)]
+    for i, future in enumerate(futures):
+        np.testing.assert_array_equal(future.result(timeout=5), np.full((2, 1), i * 2))
+    batcher.close()
+    assert max(model.batch_sizes) <= 5
+    assert batcher.stats()['largest_batch_size'] <= 5
+
+
+def test_empty_input_resolves_immediately():
+    batcher = MicroBatcher(RecordingModel())
+    assert len(batcher.submit(np.empty((0, 3), dtype=np.float32)).result(timeout=1)) == 0
+    batcher.close()
+
+
+def test_model_errors_reach_every_caller_in_the_batch():
+    def failing(batch):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(failing, max_delay_ms=50)
+    futures = [batcher.submit(np.ones((1, 2), dtype=np.float32)) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result(timeout=5)
+    batcher.close()
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from letter_smoother import HandSmoothers, LetterSmoother
+
+
+def one_hot(index, num_classes=5, confidence=0.9):
+    probs = np.full(num_classes, (1.0 - confidence) / (num_classes - 1), dtype=np.float32)
+    probs[index] = confidence
+    return probs
+
+
+@pytest.mark.parametrize('mode', ['average', 'majority'])
+def test_commits_after_hold_frames_once(mode):
+    smoother = LetterSmoother(5, window=4, hold_frames=3, mode=mode)
+    committed = [smoother.update(one_hot(2)) for _ in range(6)]
+    assert committed == [None, None, 2, None, None, None]
+
+
+def test_release_allows_the_same_letter_again():
+    smoother = LetterSmoother(5, window=4, hold_frames=2)
+    assert [smoother.update(one_hot(1)) for _ in range(2)] == [None, 1]
+    smoother.release()
+    assert [smoother.update(one_hot(1)) for _ in range(2)] == [None, 1]
+
+
+def test_changing_letter_restarts_the_streak():
+    smoother = LetterSmoother(5, window=1, hold_frames=2)
+    assert smoother.update(one_hot(0)) is None
+    assert smoother.update(one_hot(3)) is None
+    assert smoother.update(one_hot(3)) == 3
+
+
+def test_low_confidence_is_not_committed():
+    smoother = LetterSmoother(5, window=2, hold_frames=1, min_confidence=0.6)
+    assert smoother.update(one_hot(4, confidence=0.5)) is None
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        LetterSmoother(5, mode='median')
+
+
+def test_hands_keep_their_slot_when_order_swaps():
+    smoothers = HandSmoothers(5, max_hands=2)
+    assert smoothers.assign([(0.2, 0.5), (0.8, 0.5)]) == [0, 1]
+    # MediaPipe listed the hands the other way round; each keeps its smoother
+    assert smoothers.assign([(0.81, 0.5), (0.21, 0.5)]) == [1, 0]
+
+
+def test_streaks_of_two_hands_do_not_interleave():
+    smoothers = HandSmoothers(5, max_hands=2, window=2, hold_frames=2)
+    committed = []
+    for _ in range(2):
+        left, right = smoothers.assign([(0.2, 0.5), (0.8, 0.5)])
+        committed.append((smoothers[left].update(one_hot(0)), smoothers[right].update(one_hot(1))))
+    assert committed == [(None, None), (0, 1)]
+
+
+def test_far_away_hand_gets_a_released_smoother():
+    smoothers = HandSmoothers(5, max_hands=2, max_distance=0.2, window=2, hold_frames=2)
+    (slot,) = smoothers.assign([(0.2, 0.5)])
+    smoothers[slot].update(one_hot(0))
+    # Jumped across the frame: a different hand, so the half-built streak is gone
+    (slot,) = smoothers.assign([(0.9, 0.5)])
+    assert smoothers[slot].update(one_hot(0)) is None
+
+
+def test_unmatched_smoothers_are_released():
+    smoothers = HandSmoothers(5, max_hands=2, window=2, hold_frames=1)
+    (slot,) = smoothers.assign([(0.5, 0.5)])
+    assert smoothers[slot].update(one_hot(2)) == 2
+    assert smoothers.assign([]) == []
+    (slot,) = smoothers.assign([(0.5, 0.5)])
+    # Released while the hand was gone, so the same letter commits again
+    assert smoothers[slot].update(one_hot(2)) == 2
+
+
+def test_too_many_hands_is_an_error():
+    with pytest.raises(ValueError):
+        HandSmoothers(5, max_hands=1).assign([(0.1, 0.1), (0.9, 0.9)])
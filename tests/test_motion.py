@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from motion import TrajectoryRing
+
+
+def path_length(points):
+    return float(np.sum(np.hypot(*np.diff(np.asarray(points), axis=0).T)))
+
+
+def test_energy_is_path_length_of_the_window():
+    ring = TrajectoryRing(length=4)
+    points = [(0.0, 0.0), (1.0, 0.0), (1.0, 2.0), (4.0, 6.0), (4.0, 7.0), (4.0, 9.0)]
+    for i, point in enumerate(points):
+        ring.push(*point)
+        window = points[max(0, i - 3):i + 1]
+        assert ring.energy == pytest.approx(path_length(window))
+
+
+def test_ordered_into_wraps_oldest_first():
+    ring = TrajectoryRing(length=3)
+    for i in range(5):
+        ring.push(float(i), float(-i))
+    out = np.empty(6, dtype=np.float32)
+    ring.ordered_into(out)
+    np.testing.assert_array_equal(out, [2, -2, 3, -3, 4, -4])
+    assert ring.is_full() and len(ring) == 3
+
+
+def test_reset_clears_energy_and_count():
+    ring = TrajectoryRing(length=3)
+    ring.push(0.0, 0.0)
+    ring.push(3.0, 4.0)
+    ring.reset()
+    assert len(ring) == 0 and ring.energy == 0.0
+    ring.push(10.0, 10.0)
+    assert ring.energy == 0.0
@@ -0,0 +1,51 @@
+import numpy as np
+
+from landmarks import NUM_FEATURES, NUM_LANDMARKS
+from preprocessing import MIDDLE_MCP, WRIST, augment, normalize
+
+
+def random_hands(n, seed=0):
+    return np.random.default_rng(seed).uniform(0, 1, (n, NUM_FEATURES)).astype(np.float32)
+
+
+def test_wrist_at_origin_and_unit_palm():
+    out = normalize(random_hands(4)).reshape(-1, NUM_LANDMARKS, 3)
+    np.testing.assert_allclose(out[:, WRIST], 0.0, atol=1e-6)
+    np.testing.assert_allclose(np.hypot(out[:, MIDDLE_MCP, 0], out[:, MIDDLE_MCP, 1]), 1.0, rtol=1e-5)
+
+
+def test_position_and_scale_invariant():
+    hands = random_hands(3)
+    moved = hands.reshape(-1, NUM_LANDMARKS, 3) * 2.5 + np.array([0.3, -0.2, 0.1], dtype=np.float32)
+    np.testing.assert_allclose(normalize(moved.reshape(-1, NUM_FEATURES)), normalize(hands), rtol=1e-4, atol=1e-5)
+
+
+def test_mirror_flips_only_masked_rows():
+    hands = random_hands(2)
+    plain = normalize(hands).reshape(-1, NUM_LANDMARKS, 3)
+    mirrored = normalize(hands, is_left=[True, False]).reshape(-1, NUM_LANDMARKS, 3)
+    np.testing.assert_allclose(mirrored[0, :, 0], -plain[0, :, 0])
+    np.testing.assert_allclose(mirrored[0, :, 1:], plain[0, :, 1:])
+    np.testing.assert_allclose(mirrored[1], plain[1])
+
+
+def test_writes_into_out_and_accepts_a_single_vector():
+    hands = random_hands(2)
+    out = np.empty((2, NUM_FEATURES), dtype=np.float32)
+    assert np.shares_memory(normalize(hands, out=out), out)
+    assert normalize(hands[0]).shape == (1, NUM_FEATURES)
+    np.testing.assert_allclose(normalize(hands[0])[0], out[0])
+
+
+def test_augment_keeps_shape_and_input():
+    hands = normalize(random_hands(5))
+    before = hands.copy()
+    out = augment(hands, np.random.default_rng(1))
+    assert out.shape == hands.shape
+    np.testing.assert_array_equal(hands, before)
+    assert not np.allclose(out, hands)
+
+
+def test_degenerate_hand_does_not_divide_by_zero():
+    out = normalize(np.zeros((1, NUM_FEATURES), dtype=np.float32))
+    assert np.all(np.isfinite(out))
@@ -0,0 +1,42 @@
+import numpy as np
+
+from trajectory_store import count_windows, window_index, window_view
+
+
+def recordings(*rows):
+    return np.array(rows, dtype=np.int64).reshape(-1, 3)
+
+
+def test_count_windows():
+    assert count_windows(14, 15, 1) == 0
+    assert count_windows(15, 15, 1) == 1
+    assert count_windows(40, 15, 5) == 6
+
+
+def test_windows_stay_inside_their_recording():
+    (starts, labels), _ = window_index(recordings((0, 0, 17), (1, 17, 20)), window=15, stride=1)
+    assert list(starts) == [0, 1, 2, 17, 18, 19, 20, 21, 22]
+    assert list(labels) == [0, 0, 0, 1, 1, 1, 1, 1, 1]
+
+
+def test_validation_holds_out_whole_recordings_per_label():
+    rows = recordings(*[(label, i * 20, 20) for i, label in enumerate([0, 1] * 5)])
+    (train_starts, _), (val_starts, val_labels) = window_index(rows, window=15, stride=5, val_fraction=0.2)
+    # The 5th recording of each label: starts 160 (label 0) and 180 (label 1)
+    assert list(val_starts) == [160, 165, 180, 185]
+    assert list(val_labels) == [0, 0, 1, 1]
+    assert not set(train_starts) & set(val_starts)
+
+
+def test_short_recordings_still_give_validation_windows():
+    rows = recordings(*[(0, i * 17, 17) for i in range(5)])
+    (_, _), (val_starts, _) = window_index(rows, window=15, stride=1, val_fraction=0.2)
+    assert len(val_starts) == 3
+
+
+def test_window_view_rows_are_flattened_point_windows():
+    points = np.arange(20, dtype=np.float32).reshape(10, 2)
+    view = window_view(points, 3)
+    assert view.shape == (8, 6)
+    np.testing.assert_array_equal(view[2], points[2:5].reshape(-1))
+    assert np.shares_memory(view, points)